@@ -2,38 +2,166 @@
 Database connection and session management
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import Integer, create_engine, event, inspect
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import QueuePool
+from sqlalchemy.util import LRUCache
 from contextlib import contextmanager
 import os
 from pathlib import Path
 
 from .models import Base
+from .types import CodedEnum
 
 # Database file location
 DB_DIR = Path(__file__).parent.parent.parent / "data"
 DB_DIR.mkdir(exist_ok=True)
-DATABASE_URL = f"sqlite:///{DB_DIR}/oil_fields.db"
+DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{DB_DIR}/oil_fields.db")
 
-# Create engine
-# Using StaticPool for SQLite to handle threading issues
+# Number of pooled read-only connections
+READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", "8"))
+
+# Compiled statement cache shared by the read and write engines, so a
+# statement compiled on one is reused by the other
+COMPILED_CACHE = LRUCache(1000)
+
+# Create engines
+# SQLite allows a single writer, so all writes go through one pooled
+# connection; readers get their own pool and run in parallel under WAL.
+# check_same_thread is disabled since FastAPI hands sessions across threads.
 engine = create_engine(
     DATABASE_URL,
     connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
+    poolclass=QueuePool,
+    pool_size=1,
+    max_overflow=0,
+    execution_options={"compiled_cache": COMPILED_CACHE},
     echo=False  # Set to True for SQL query logging
 )
 
-# Create sessionmaker
+read_engine = create_engine(
+    DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=QueuePool,
+    pool_size=READ_POOL_SIZE,
+    max_overflow=0,
+    execution_options={"compiled_cache": COMPILED_CACHE},
+    echo=False
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Configure SQLite on each new connection
+
+    WAL lets readers run alongside the single writer, and synchronous=NORMAL
+    is safe under WAL while cutting fsyncs per commit.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MB page cache
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256 MB memory-mapped I/O
+    cursor.close()
+
+
+@event.listens_for(read_engine, "connect")
+def _set_read_only_pragmas(dbapi_connection, connection_record):
+    """Configure read connections and reject any write issued through them"""
+    _set_sqlite_pragmas(dbapi_connection, connection_record)
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only=1")
+    cursor.close()
+
+
+event.listen(engine, "connect", _set_sqlite_pragmas)
+
+# Create sessionmakers
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+
+def _is_outdated(table, existing_types) -> bool:
+    """
+    Whether an existing table no longer matches its model: columns were
+    added or removed, or a CodedEnum column still stores strings
+    """
+    if set(existing_types) != set(table.columns.keys()):
+        return True
+    return any(
+        isinstance(column.type, CodedEnum) and not isinstance(existing_types[column.name], Integer)
+        for column in table.columns
+    )
+
+
+def _rebuild_table(connection, table, existing_types) -> int:
+    """
+    Recreate a table from its model and copy back the columns it shares
+    with the old one, converting legacy strings in CodedEnum columns to codes
+
+    Returns the number of rows copied.
+    """
+    columns = [name for name in table.columns.keys() if name in existing_types]
+    column_list = ", ".join(f'"{name}"' for name in columns)
+    to_code = [
+        table.columns[name].type.to_code if isinstance(table.columns[name].type, CodedEnum) else None
+        for name in columns
+    ]
+
+    rows = [
+        tuple(
+            convert(value) if convert is not None and isinstance(value, str) else value
+            for convert, value in zip(to_code, row)
+        )
+        for row in connection.exec_driver_sql(f'SELECT {column_list} FROM "{table.name}"')
+    ]
+
+    connection.exec_driver_sql(f'DROP TABLE "{table.name}"')
+    table.create(connection)
+    if rows:
+        placeholders = ", ".join("?" * len(columns))
+        connection.exec_driver_sql(
+            f'INSERT INTO "{table.name}" ({column_list}) VALUES ({placeholders})', rows
+        )
+    return len(rows)
+
+
+def upgrade_db():
+    """
+    Bring an existing database file in line with the models
+
+    create_all never alters existing tables, so tables whose columns differ
+    from the models (including CodedEnum columns still holding strings) are
+    rebuilt here with their rows preserved.
+    """
+    inspector = inspect(engine)
+    outdated = []
+    for table in Base.metadata.sorted_tables:
+        if inspector.has_table(table.name):
+            existing_types = {column["name"]: column["type"] for column in inspector.get_columns(table.name)}
+            if _is_outdated(table, existing_types):
+                outdated.append((table, existing_types))
+
+    with engine.begin() as connection:
+        for table, existing_types in outdated:
+            row_count = _rebuild_table(connection, table, existing_types)
+            print(f"Rebuilt table {table.name} ({row_count} rows)")
 
 
 def init_db():
     """
-    Initialize database - create all tables
+    Initialize database - upgrade outdated tables and create missing ones
     """
+    upgrade_db()
     Base.metadata.create_all(bind=engine)
+
+    # create_all skips tables that already exist, so add any indexes
+    # declared after the database file was first created
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
     print(f"Database initialized at: {DATABASE_URL}")
 
 
@@ -47,13 +175,30 @@ def drop_db():
 
 def get_db() -> Session:
     """
-    Dependency for FastAPI to get database session
+    Dependency for FastAPI to get a read-only database session
 
     Usage in FastAPI:
         @app.get("/items")
         def read_items(db: Session = Depends(get_db)):
             return db.query(OilField).all()
     """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def get_write_db() -> Session:
+    """
+    Dependency for FastAPI to get a database session that can write
+
+    Usage in FastAPI:
+        @app.post("/items")
+        def create_item(db: Session = Depends(get_write_db)):
+            db.add(item)
+            db.commit()
+    """
     db = SessionLocal()
     try:
         yield db
@@ -3,49 +3,87 @@ SQLAlchemy database models for Norwegian oil fields and cable inspection
 """
 
 from sqlalchemy import (
-    Column, Integer, String, Float, Boolean, DateTime, Text, ForeignKey,
-    CheckConstraint, UniqueConstraint, Index
+    Integer, String, Float, Boolean, Text, ForeignKey,
+    CheckConstraint, UniqueConstraint, Index, func
 )
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from typing import List, Optional
 from datetime import datetime
 
-Base = declarative_base()
+from .types import CodedEnum, UTCDateTime
+
+
+# Small-integer coded value sets; append new values at the end only
+FieldStatusType = CodedEnum(('producing', 'planned', 'under_development', 'shutdown', 'decommissioned'))
+SeaAreaType = CodedEnum(('north_sea', 'norwegian_sea', 'barents_sea'))
+PlatformTypeType = CodedEnum((
+    'condeep', 'steel_jacket', 'fpso', 'semi_submersible', 'tlp', 'spar', 'subsea', 'unmanned', 'onshore'
+))
+CableTypeType = CodedEnum(('power', 'communication', 'umbilical', 'fiber_optic'))
+ConditionType = CodedEnum(('excellent', 'good', 'fair', 'poor', 'critical', 'unknown'))
+
+
+class Base(DeclarativeBase):
+    """Declarative base for all database models"""
+    pass
+
+
+def _created_at_column():
+    """
+    Creation timestamp evaluated by SQLite (CURRENT_TIMESTAMP is UTC)
+    server_default puts the default in the DDL; the SQL-expression default
+    covers databases created before the column had one
+    """
+    return mapped_column(
+        UTCDateTime,
+        default=func.current_timestamp(),
+        server_default=func.current_timestamp()
+    )
+
+
+def _updated_at_column():
+    """Like _created_at_column, and refreshed by SQLite on every UPDATE"""
+    return mapped_column(
+        UTCDateTime,
+        default=func.current_timestamp(),
+        server_default=func.current_timestamp(),
+        onupdate=func.current_timestamp()
+    )
 
 
 class OilField(Base):
     """Main oil/gas field entity"""
     __tablename__ = 'oil_fields'
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    field_id = Column(String(50), unique=True, nullable=False, index=True)
-    name = Column(String(100), nullable=False)
-    operator = Column(String(100), nullable=False, index=True)
-    status = Column(String(20), nullable=False, index=True)
-    discovery_year = Column(Integer)
-    production_start_year = Column(Integer)
-    sea_area = Column(String(20), nullable=False, index=True)
-    resource_type = Column(String(30), nullable=False)
-    description = Column(Text)
-    infrastructure_notes = Column(Text)
-    estimated_resources_mmboe = Column(Float)
-    hub_field_id = Column(String(50), ForeignKey('oil_fields.field_id'))
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    field_id: Mapped[str] = mapped_column(String(50), unique=True, nullable=False, index=True)
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    operator: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
+    status: Mapped[str] = mapped_column(FieldStatusType, nullable=False, index=True)
+    discovery_year: Mapped[Optional[int]] = mapped_column(Integer)
+    production_start_year: Mapped[Optional[int]] = mapped_column(Integer)
+    sea_area: Mapped[str] = mapped_column(SeaAreaType, nullable=False, index=True)
+    resource_type: Mapped[str] = mapped_column(String(30), nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(Text)
+    infrastructure_notes: Mapped[Optional[str]] = mapped_column(Text)
+    estimated_resources_mmboe: Mapped[Optional[float]] = mapped_column(Float)
+    hub_field_id: Mapped[Optional[str]] = mapped_column(String(50), ForeignKey('oil_fields.field_id'))
+    created_at: Mapped[Optional[datetime]] = _created_at_column()
+    updated_at: Mapped[Optional[datetime]] = _updated_at_column()
 
     # Relationships
-    location = relationship("FieldLocation", back_populates="field", uselist=False, cascade="all, delete-orphan")
-    platforms = relationship("Platform", back_populates="field", cascade="all, delete-orphan")
-    license_blocks = relationship("LicenseBlock", back_populates="field", cascade="all, delete-orphan")
+    location: Mapped[Optional["FieldLocation"]] = relationship("FieldLocation", back_populates="field", uselist=False, cascade="all, delete-orphan")
+    platforms: Mapped[List["Platform"]] = relationship("Platform", back_populates="field", cascade="all, delete-orphan")
+    license_blocks: Mapped[List["LicenseBlock"]] = relationship("LicenseBlock", back_populates="field", cascade="all, delete-orphan")
 
     # Hub-satellite relationships
-    satellites = relationship(
+    satellites: Mapped[List["FieldRelationship"]] = relationship(
         "FieldRelationship",
         foreign_keys="FieldRelationship.hub_field_id",
         back_populates="hub_field",
         cascade="all, delete-orphan"
     )
-    hub_connections = relationship(
+    hub_connections: Mapped[List["FieldRelationship"]] = relationship(
         "FieldRelationship",
         foreign_keys="FieldRelationship.satellite_field_id",
         back_populates="satellite_field",
@@ -53,24 +91,24 @@ class OilField(Base):
     )
 
     # Cable routes
-    cable_routes_from = relationship(
+    cable_routes_from: Mapped[List["CableRoute"]] = relationship(
         "CableRoute",
         foreign_keys="CableRoute.start_field_id",
         back_populates="start_field",
         cascade="all, delete-orphan"
     )
-    cable_routes_to = relationship(
+    cable_routes_to: Mapped[List["CableRoute"]] = relationship(
         "CableRoute",
         foreign_keys="CableRoute.end_field_id",
         back_populates="end_field",
         cascade="all, delete-orphan"
     )
 
-    cluster_memberships = relationship("ClusterMember", back_populates="field", cascade="all, delete-orphan")
+    cluster_memberships: Mapped[List["ClusterMember"]] = relationship("ClusterMember", back_populates="field", cascade="all, delete-orphan")
 
     __table_args__ = (
-        CheckConstraint("status IN ('producing', 'planned', 'under_development', 'shutdown', 'decommissioned')"),
-        CheckConstraint("sea_area IN ('north_sea', 'norwegian_sea', 'barents_sea')"),
+        CheckConstraint(FieldStatusType.check_sql('status')),
+        CheckConstraint(SeaAreaType.check_sql('sea_area')),
     )
 
     def __repr__(self):
@@ -81,18 +119,18 @@ class FieldLocation(Base):
     """Geographic location data for oil fields"""
     __tablename__ = 'field_locations'
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    field_id = Column(String(50), ForeignKey('oil_fields.field_id'), unique=True, nullable=False)
-    latitude = Column(Float, nullable=False)
-    longitude = Column(Float, nullable=False)
-    water_depth_min = Column(Float)
-    water_depth_max = Column(Float)
-    distance_from_shore_km = Column(Float)
-    nearest_city = Column(String(100))
-    created_at = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    field_id: Mapped[str] = mapped_column(String(50), ForeignKey('oil_fields.field_id'), unique=True, nullable=False)
+    latitude: Mapped[float] = mapped_column(Float, nullable=False)
+    longitude: Mapped[float] = mapped_column(Float, nullable=False)
+    water_depth_min: Mapped[Optional[float]] = mapped_column(Float)
+    water_depth_max: Mapped[Optional[float]] = mapped_column(Float)
+    distance_from_shore_km: Mapped[Optional[float]] = mapped_column(Float)
+    nearest_city: Mapped[Optional[str]] = mapped_column(String(100))
+    created_at: Mapped[Optional[datetime]] = _created_at_column()
 
     # Relationship
-    field = relationship("OilField", back_populates="location")
+    field: Mapped["OilField"] = relationship("OilField", back_populates="location")
 
     __table_args__ = (
         CheckConstraint('latitude >= -90 AND latitude <= 90'),
@@ -108,13 +146,12 @@ class LicenseBlock(Base):
     """License blocks associated with fields"""
     __tablename__ = 'license_blocks'
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    field_id = Column(String(50), ForeignKey('oil_fields.field_id'), nullable=False, index=True)
-    block_number = Column(String(20), nullable=False, index=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    field_id: Mapped[str] = mapped_column(String(50), ForeignKey('oil_fields.field_id'), nullable=False, index=True)
+    block_number: Mapped[str] = mapped_column(String(20), nullable=False, index=True)
 
     # Relationship
-    field = relationship("OilField", back_populates="license_blocks")
+    field: Mapped["OilField"] = relationship("OilField", back_populates="license_blocks")
 
     __table_args__ = (
         UniqueConstraint('field_id', 'block_number', name='uq_field_block'),
@@ -128,21 +165,21 @@ class Platform(Base):
     """Individual platforms/installations within fields"""
     __tablename__ = 'platforms'
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    field_id = Column(String(50), ForeignKey('oil_fields.field_id'), nullable=False, index=True)
-    name = Column(String(100), nullable=False)
-    platform_type = Column(String(30), nullable=False, index=True)
-    installation_year = Column(Integer)
-    operational = Column(Boolean, default=True, index=True)
-    unmanned = Column(Boolean, default=False)
-    description = Column(Text)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    field_id: Mapped[str] = mapped_column(String(50), ForeignKey('oil_fields.field_id'), nullable=False, index=True)
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    platform_type: Mapped[str] = mapped_column(PlatformTypeType, nullable=False, index=True)
+    installation_year: Mapped[Optional[int]] = mapped_column(Integer)
+    operational: Mapped[Optional[bool]] = mapped_column(Boolean, default=True, index=True)
+    unmanned: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    description: Mapped[Optional[str]] = mapped_column(Text)
+    created_at: Mapped[Optional[datetime]] = _created_at_column()
 
     # Relationship
-    field = relationship("OilField", back_populates="platforms")
+    field: Mapped["OilField"] = relationship("OilField", back_populates="platforms")
 
     __table_args__ = (
-        CheckConstraint("platform_type IN ('condeep', 'steel_jacket', 'fpso', 'semi_submersible', 'tlp', 'spar', 'subsea', 'unmanned', 'onshore')"),
+        CheckConstraint(PlatformTypeType.check_sql('platform_type')),
     )
 
     def __repr__(self):
@@ -153,11 +190,11 @@ class Operator(Base):
     """Operating companies"""
     __tablename__ = 'operators'
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    company_name = Column(String(100), unique=True, nullable=False)
-    country = Column(String(50))
-    contact_info = Column(Text)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    company_name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
+    country: Mapped[Optional[str]] = mapped_column(String(50))
+    contact_info: Mapped[Optional[str]] = mapped_column(Text)
+    created_at: Mapped[Optional[datetime]] = _created_at_column()
 
     def __repr__(self):
         return f"<Operator(name='{self.company_name}')>"
@@ -167,15 +204,14 @@ class FieldRelationship(Base):
     """Hub-satellite and tieback relationships between fields"""
     __tablename__ = 'field_relationships'
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    hub_field_id = Column(String(50), ForeignKey('oil_fields.field_id'), nullable=False, index=True)
-    satellite_field_id = Column(String(50), ForeignKey('oil_fields.field_id'), nullable=False, index=True)
-    relationship_type = Column(String(30), default='satellite')
-    created_at = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    hub_field_id: Mapped[str] = mapped_column(String(50), ForeignKey('oil_fields.field_id'), nullable=False, index=True)
+    satellite_field_id: Mapped[str] = mapped_column(String(50), ForeignKey('oil_fields.field_id'), nullable=False, index=True)
+    relationship_type: Mapped[Optional[str]] = mapped_column(String(30), default='satellite')
 
     # Relationships
-    hub_field = relationship("OilField", foreign_keys=[hub_field_id], back_populates="satellites")
-    satellite_field = relationship("OilField", foreign_keys=[satellite_field_id], back_populates="hub_connections")
+    hub_field: Mapped["OilField"] = relationship("OilField", foreign_keys=[hub_field_id], back_populates="satellites")
+    satellite_field: Mapped["OilField"] = relationship("OilField", foreign_keys=[satellite_field_id], back_populates="hub_connections")
 
     __table_args__ = (
         UniqueConstraint('hub_field_id', 'satellite_field_id', name='uq_hub_satellite'),
@@ -190,27 +226,28 @@ class CableRoute(Base):
     """Submarine cables connecting installations"""
     __tablename__ = 'cable_routes'
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    route_id = Column(String(50), unique=True, nullable=False, index=True)
-    name = Column(String(100), nullable=False)
-    start_field_id = Column(String(50), ForeignKey('oil_fields.field_id'), nullable=False, index=True)
-    end_field_id = Column(String(50), ForeignKey('oil_fields.field_id'), nullable=False, index=True)
-    cable_type = Column(String(30), nullable=False, index=True)
-    length_km = Column(Float, nullable=False)
-    installation_year = Column(Integer)
-    operational = Column(Boolean, default=True)
-    inspection_required = Column(Boolean, default=True, index=True)
-    last_inspection_date = Column(DateTime)
-    notes = Column(Text)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    route_id: Mapped[str] = mapped_column(String(50), unique=True, nullable=False, index=True)
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    start_field_id: Mapped[str] = mapped_column(String(50), ForeignKey('oil_fields.field_id'), nullable=False, index=True)
+    end_field_id: Mapped[str] = mapped_column(String(50), ForeignKey('oil_fields.field_id'), nullable=False, index=True)
+    cable_type: Mapped[str] = mapped_column(CableTypeType, nullable=False, index=True)
+    length_km: Mapped[float] = mapped_column(Float, nullable=False)
+    installation_year: Mapped[Optional[int]] = mapped_column(Integer)
+    operational: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
+    inspection_required: Mapped[Optional[bool]] = mapped_column(Boolean, default=True, index=True)
+    last_inspection_date: Mapped[Optional[datetime]] = mapped_column(UTCDateTime)
+    notes: Mapped[Optional[str]] = mapped_column(Text)
+    created_at: Mapped[Optional[datetime]] = _created_at_column()
 
     # Relationships
-    start_field = relationship("OilField", foreign_keys=[start_field_id], back_populates="cable_routes_from")
-    end_field = relationship("OilField", foreign_keys=[end_field_id], back_populates="cable_routes_to")
-    inspections = relationship("CableInspection", back_populates="cable_route", cascade="all, delete-orphan")
+    start_field: Mapped["OilField"] = relationship("OilField", foreign_keys=[start_field_id], back_populates="cable_routes_from")
+    end_field: Mapped["OilField"] = relationship("OilField", foreign_keys=[end_field_id], back_populates="cable_routes_to")
+    inspections: Mapped[List["CableInspection"]] = relationship("CableInspection", back_populates="cable_route", cascade="all, delete-orphan")
 
     __table_args__ = (
-        CheckConstraint("cable_type IN ('power', 'communication', 'umbilical', 'fiber_optic')"),
+        CheckConstraint(CableTypeType.check_sql('cable_type')),
+        Index('idx_cable_insp_needed', 'inspection_required', 'last_inspection_date'),
     )
 
     def __repr__(self):
@@ -221,37 +258,39 @@ class CableInspection(Base):
     """Inspection records for cable routes"""
     __tablename__ = 'cable_inspections'
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    inspection_id = Column(String(50), unique=True, nullable=False, index=True)
-    cable_route_id = Column(Integer, ForeignKey('cable_routes.id'), nullable=False, index=True)
-    inspection_date = Column(DateTime, nullable=False, index=True)
-    latitude = Column(Float)
-    longitude = Column(Float)
-    depth = Column(Float)
-    image_id = Column(String(100))  # Links to uploaded image
-    condition = Column(String(20), index=True)
-    detected_issues = Column(Text)  # JSON array stored as TEXT
-    confidence_score = Column(Float)
-    recommendations = Column(Text)  # JSON array
-    inspector = Column(String(100))
-    notes = Column(Text)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    inspection_id: Mapped[str] = mapped_column(String(50), unique=True, nullable=False, index=True)
+    cable_route_id: Mapped[int] = mapped_column(Integer, ForeignKey('cable_routes.id'), nullable=False, index=True)
+    inspection_date: Mapped[datetime] = mapped_column(UTCDateTime, nullable=False, index=True)
+    latitude: Mapped[Optional[float]] = mapped_column(Float)
+    longitude: Mapped[Optional[float]] = mapped_column(Float)
+    depth: Mapped[Optional[float]] = mapped_column(Float)
+    image_id: Mapped[Optional[str]] = mapped_column(String(100), index=True)  # Links to uploaded image
+    condition: Mapped[Optional[str]] = mapped_column(ConditionType, index=True)
+    detected_issues: Mapped[Optional[str]] = mapped_column(Text)  # JSON array stored as TEXT
+    confidence_score: Mapped[Optional[float]] = mapped_column(Float)
+    recommendations: Mapped[Optional[str]] = mapped_column(Text)  # JSON array
+    inspector: Mapped[Optional[str]] = mapped_column(String(100))
+    notes: Mapped[Optional[str]] = mapped_column(Text)
 
     # Multi-model analysis fields
-    models_used = Column(Text)  # JSON array of model types used
-    model_results = Column(Text)  # JSON object with results per model
-    consensus_detections = Column(Text)  # JSON array of consensus detections
-    analysis_metadata = Column(Text)  # JSON metadata about multi-model analysis
+    models_used: Mapped[Optional[str]] = mapped_column(Text)  # JSON array of model types used
+    model_results: Mapped[Optional[str]] = mapped_column(Text)  # JSON object with results per model
+    consensus_detections: Mapped[Optional[str]] = mapped_column(Text)  # JSON array of consensus detections
+    analysis_metadata: Mapped[Optional[str]] = mapped_column(Text)  # JSON metadata about multi-model analysis
 
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[Optional[datetime]] = _created_at_column()
 
     # Relationship
-    cable_route = relationship("CableRoute", back_populates="inspections")
+    cable_route: Mapped["CableRoute"] = relationship("CableRoute", back_populates="inspections")
 
     __table_args__ = (
         CheckConstraint('latitude >= -90 AND latitude <= 90'),
         CheckConstraint('longitude >= -180 AND longitude <= 180'),
-        CheckConstraint("condition IN ('excellent', 'good', 'fair', 'poor', 'critical', 'unknown')"),
+        CheckConstraint(ConditionType.check_sql('condition')),
         Index('idx_inspection_coordinates', 'latitude', 'longitude'),
+        Index('idx_insp_route_date', 'cable_route_id', inspection_date.desc()),
+        Index('idx_insp_condition_date', 'condition', inspection_date.desc()),
     )
 
     def __repr__(self):
@@ -262,16 +301,16 @@ class InfrastructureCluster(Base):
     """Logical groupings of interconnected fields"""
     __tablename__ = 'infrastructure_clusters'
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    cluster_id = Column(String(50), unique=True, nullable=False, index=True)
-    name = Column(String(100), nullable=False)
-    hub_field_id = Column(String(50), ForeignKey('oil_fields.field_id'), nullable=False)
-    sea_area = Column(String(20), nullable=False)
-    description = Column(Text)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    cluster_id: Mapped[str] = mapped_column(String(50), unique=True, nullable=False, index=True)
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    hub_field_id: Mapped[str] = mapped_column(String(50), ForeignKey('oil_fields.field_id'), nullable=False)
+    sea_area: Mapped[str] = mapped_column(SeaAreaType, nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(Text)
+    created_at: Mapped[Optional[datetime]] = _created_at_column()
 
     # Relationships
-    members = relationship("ClusterMember", back_populates="cluster", cascade="all, delete-orphan")
+    members: Mapped[List["ClusterMember"]] = relationship("ClusterMember", back_populates="cluster", cascade="all, delete-orphan")
 
     def __repr__(self):
         return f"<InfrastructureCluster(id='{self.cluster_id}', name='{self.name}')>"
@@ -281,14 +320,13 @@ class ClusterMember(Base):
     """Junction table for cluster membership"""
     __tablename__ = 'cluster_members'
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    cluster_id = Column(String(50), ForeignKey('infrastructure_clusters.cluster_id'), nullable=False, index=True)
-    field_id = Column(String(50), ForeignKey('oil_fields.field_id'), nullable=False, index=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    cluster_id: Mapped[str] = mapped_column(String(50), ForeignKey('infrastructure_clusters.cluster_id'), nullable=False, index=True)
+    field_id: Mapped[str] = mapped_column(String(50), ForeignKey('oil_fields.field_id'), nullable=False, index=True)
 
     # Relationships
-    cluster = relationship("InfrastructureCluster", back_populates="members")
-    field = relationship("OilField", back_populates="cluster_memberships")
+    cluster: Mapped["InfrastructureCluster"] = relationship("InfrastructureCluster", back_populates="members")
+    field: Mapped["OilField"] = relationship("OilField", back_populates="cluster_memberships")
 
     __table_args__ = (
         UniqueConstraint('cluster_id', 'field_id', name='uq_cluster_field'),
@@ -302,15 +340,15 @@ class ClientProfile(Base):
     """Client profile for the system user"""
     __tablename__ = 'client_profiles'
 
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    profile_key = Column(String(50), unique=True, nullable=False, index=True, default="default_profile")
-    name = Column(String(100), nullable=False)
-    company = Column(String(100), nullable=False)
-    role = Column(String(100), nullable=False)
-    email = Column(String(150))
-    phone = Column(String(50))
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    profile_key: Mapped[str] = mapped_column(String(50), unique=True, nullable=False, index=True, default="default_profile")
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    company: Mapped[str] = mapped_column(String(100), nullable=False)
+    role: Mapped[str] = mapped_column(String(100), nullable=False)
+    email: Mapped[Optional[str]] = mapped_column(String(150))
+    phone: Mapped[Optional[str]] = mapped_column(String(50))
+    created_at: Mapped[Optional[datetime]] = _created_at_column()
+    updated_at: Mapped[Optional[datetime]] = _updated_at_column()
 
     def __repr__(self):
         return f"<ClientProfile(name='{self.name}', company='{self.company}', role='{self.role}')>"
@@ -2,11 +2,30 @@
 Database query utilities for common operations
 """
 
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
-from typing import List, Optional, Tuple
-from datetime import datetime, timedelta
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.engine import Row, ScalarResult
+from sqlalchemy.exc import OperationalError
+from sqlalchemy import func, and_, or_, select, bindparam, case, event
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from typing import List, Optional, Tuple, Sequence, Any
+from datetime import datetime, timedelta, timezone
+from itertools import count
 import math
+import threading
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    from scipy.spatial import cKDTree
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
 
 from .models import (
     OilField, FieldLocation, Platform, LicenseBlock,
@@ -15,6 +34,60 @@ from .models import (
 )
 
 
+# ===== Prebuilt Lookup Statements =====
+# Single-row lookups are built once at import time and executed with bound
+# parameters, so hot paths skip Query construction on every call.
+
+_field_by_id_stmt = select(OilField).where(
+    OilField.field_id == bindparam("field_id")
+).limit(1)
+
+_cable_route_by_id_stmt = select(CableRoute).where(
+    CableRoute.route_id == bindparam("route_id")
+).limit(1)
+
+_cluster_by_id_stmt = select(InfrastructureCluster).where(
+    InfrastructureCluster.cluster_id == bindparam("cluster_id")
+).limit(1)
+
+_latest_inspection_stmt = select(CableInspection).where(
+    CableInspection.cable_route_id == bindparam("cable_route_id")
+).order_by(CableInspection.inspection_date.desc()).limit(1)
+
+# Joins on the unique route_id so a route's history is one query; the
+# composite (cable_route_id, inspection_date DESC) index serves the ordering
+_inspections_for_route_stmt = select(CableInspection).join(CableInspection.cable_route).where(
+    CableRoute.route_id == bindparam("route_id")
+).order_by(CableInspection.inspection_date.desc()).limit(bindparam("limit"))
+
+_profile_by_key_stmt = select(ClientProfile).where(
+    ClientProfile.profile_key == bindparam("profile_key")
+).limit(1)
+
+# Expanding IN parameters keep one cache entry regardless of list length
+_fields_by_ids_stmt = select(OilField).options(joinedload(OilField.location)).where(
+    OilField.field_id.in_(bindparam("field_ids", expanding=True))
+)
+
+_inspections_by_ids_stmt = select(CableInspection).where(
+    CableInspection.id.in_(bindparam("ids", expanding=True))
+)
+
+
+# ===== Streaming =====
+
+# Rows hydrated per batch by the iter_* helpers
+STREAM_BATCH_SIZE = 1000
+
+
+def _stream(db: Session, stmt, batch_size: int) -> ScalarResult:
+    """
+    Execute an ORM select and stream its entities in batches
+    The result must be consumed before the session is closed
+    """
+    return db.execute(stmt.execution_options(yield_per=batch_size)).scalars()
+
+
 # ===== Oil Field Queries =====
 
 def get_all_fields(db: Session, skip: int = 0, limit: int = 100) -> List[OilField]:
@@ -22,24 +95,63 @@ def get_all_fields(db: Session, skip: int = 0, limit: int = 100) -> List[OilFiel
     return db.query(OilField).offset(skip).limit(limit).all()
 
 
+def get_fields_summary(db: Session, skip: int = 0, limit: int = 100) -> Sequence[Row]:
+    """
+    Get a paginated listing of (field_id, name, operator, status) rows
+    Skips ORM hydration; use get_all_fields when entities are needed
+    """
+    return db.execute(
+        select(OilField.field_id, OilField.name, OilField.operator, OilField.status)
+        .offset(skip)
+        .limit(limit)
+    ).all()
+
+
 def get_field_by_id(db: Session, field_id: str) -> Optional[OilField]:
     """Get oil field by field_id"""
-    return db.query(OilField).filter(OilField.field_id == field_id).first()
+    return db.execute(_field_by_id_stmt, {"field_id": field_id}).scalars().first()
+
+
+def iter_fields_by_operator(
+    db: Session,
+    operator: str,
+    batch_size: int = STREAM_BATCH_SIZE
+) -> ScalarResult[OilField]:
+    """Stream fields operated by a specific company in batches"""
+    return _stream(db, select(OilField).where(OilField.operator == operator), batch_size)
 
 
 def get_fields_by_operator(db: Session, operator: str) -> List[OilField]:
     """Get all fields operated by a specific company"""
-    return db.query(OilField).filter(OilField.operator == operator).all()
+    return iter_fields_by_operator(db, operator).all()
+
+
+def iter_fields_by_sea_area(
+    db: Session,
+    sea_area: str,
+    batch_size: int = STREAM_BATCH_SIZE
+) -> ScalarResult[OilField]:
+    """Stream fields in a specific sea area in batches"""
+    return _stream(db, select(OilField).where(OilField.sea_area == sea_area), batch_size)
 
 
 def get_fields_by_sea_area(db: Session, sea_area: str) -> List[OilField]:
     """Get all fields in a specific sea area"""
-    return db.query(OilField).filter(OilField.sea_area == sea_area).all()
+    return iter_fields_by_sea_area(db, sea_area).all()
+
+
+def iter_fields_by_status(
+    db: Session,
+    status: str,
+    batch_size: int = STREAM_BATCH_SIZE
+) -> ScalarResult[OilField]:
+    """Stream fields with a specific status in batches"""
+    return _stream(db, select(OilField).where(OilField.status == status), batch_size)
 
 
 def get_fields_by_status(db: Session, status: str) -> List[OilField]:
     """Get all fields with a specific status"""
-    return db.query(OilField).filter(OilField.status == status).all()
+    return iter_fields_by_status(db, status).all()
 
 
 def get_producing_fields(db: Session) -> List[OilField]:
@@ -59,24 +171,192 @@ def search_fields(db: Session, query: str) -> List[OilField]:
     ).all()
 
 
+def bulk_upsert_fields(db: Session, rows: Sequence[dict]) -> int:
+    """
+    Insert or update oil fields keyed on field_id in one batched statement.
+
+    All rows must share the same keys. Existing fields get every supplied
+    column overwritten; the caller commits.
+    """
+    if not rows:
+        return 0
+
+    stmt = sqlite_insert(OilField)
+    update_columns = {
+        key: stmt.excluded[key]
+        for key in rows[0]
+        if key not in ("id", "field_id", "created_at")
+    }
+    # ON CONFLICT DO UPDATE skips Python-side onupdate hooks
+    update_columns.setdefault("updated_at", func.current_timestamp())
+    stmt = stmt.on_conflict_do_update(index_elements=["field_id"], set_=update_columns)
+
+    db.execute(stmt, list(rows))
+    return len(rows)
+
+
 # ===== Location-based Queries =====
 
+_EARTH_RADIUS_KM = 6371.0
+_EARTH_DIAMETER_KM = 2 * _EARTH_RADIUS_KM
+_DEG_TO_RAD = math.pi / 180
+
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """
     Calculate distance between two coordinates in kilometers using Haversine formula
     """
-    R = 6371  # Earth radius in kilometers
+    lat1_rad = lat1 * _DEG_TO_RAD
+    lat2_rad = lat2 * _DEG_TO_RAD
+    sin_dlat = math.sin((lat2_rad - lat1_rad) * 0.5)
+    sin_dlon = math.sin((lon2 - lon1) * _DEG_TO_RAD * 0.5)
+
+    a = sin_dlat * sin_dlat + math.cos(lat1_rad) * math.cos(lat2_rad) * sin_dlon * sin_dlon
+
+    # 2 * asin(sqrt(a)) equals 2 * atan2(sqrt(a), sqrt(1 - a)) with one fewer sqrt;
+    # min() guards asin against rounding just above 1 for antipodal points
+    return _EARTH_DIAMETER_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _haversine_np(
+    lat0: float,
+    lon0: float,
+    lats: np.ndarray,
+    lons: np.ndarray
+) -> np.ndarray:
+    """
+    Vectorized Haversine distance in kilometers from one coordinate to arrays of coordinates
+    """
+    lat0_rad = lat0 * _DEG_TO_RAD
+    lats_rad = np.radians(lats)
+    sin_dlat = np.sin((lats_rad - lat0_rad) * 0.5)
+    sin_dlon = np.sin(np.radians(lons - lon0) * 0.5)
+
+    a = sin_dlat * sin_dlat + math.cos(lat0_rad) * np.cos(lats_rad) * sin_dlon * sin_dlon
+
+    return _EARTH_DIAMETER_KM * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+
+
+# Row count above which the Numba kernel beats the NumPy broadcast
+_NUMBA_MIN_ROWS = 10_000
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _haversine_nb(lat0, lon0, lats, lons):
+        """Parallel Haversine distance in kilometers (Numba JIT)"""
+        n = lats.shape[0]
+        out = np.empty(n, dtype=np.float64)
+        lat0_rad = lat0 * _DEG_TO_RAD
+        cos_lat0 = math.cos(lat0_rad)
+        for i in prange(n):
+            lat_rad = lats[i] * _DEG_TO_RAD
+            sin_dlat = math.sin((lat_rad - lat0_rad) * 0.5)
+            sin_dlon = math.sin((lons[i] - lon0) * _DEG_TO_RAD * 0.5)
+            a = sin_dlat * sin_dlat + cos_lat0 * math.cos(lat_rad) * sin_dlon * sin_dlon
+            out[i] = _EARTH_DIAMETER_KM * math.asin(min(1.0, math.sqrt(a)))
+        return out
+
+
+def _bounding_box(
+    latitude: float,
+    longitude: float,
+    radius_km: float
+) -> Tuple[float, float, Optional[float], Optional[float]]:
+    """
+    Latitude/longitude box enclosing every point within radius_km of a coordinate
+    Returns (min_lat, max_lat, min_lon, max_lon); longitude bounds are None when
+    the circle reaches a pole or crosses the antimeridian
+    """
+    angular = radius_km / _EARTH_RADIUS_KM
+    dlat = math.degrees(angular)
+    min_lat = latitude - dlat
+    max_lat = latitude + dlat
+
+    if min_lat <= -90 or max_lat >= 90 or angular >= math.pi / 2:
+        return max(min_lat, -90.0), min(max_lat, 90.0), None, None
+
+    dlon = math.degrees(math.asin(math.sin(angular) / math.cos(math.radians(latitude))))
+    min_lon = longitude - dlon
+    max_lon = longitude + dlon
+
+    if min_lon < -180 or max_lon > 180:
+        return min_lat, max_lat, None, None
+
+    return min_lat, max_lat, min_lon, max_lon
+
+
+def _rank_by_distance(
+    rows: Sequence[Any],
+    latitude: float,
+    longitude: float,
+    radius_km: Optional[float] = None,
+    count: Optional[int] = None
+) -> List[Tuple[Any, float]]:
+    """
+    Rank (key, latitude, longitude) rows by distance from a coordinate
+    Returns list of (key, distance_km) tuples sorted by distance, optionally
+    limited to rows within radius_km and/or the nearest `count` rows
+    """
+    if not rows:
+        return []
+
+    n = len(rows)
+    lats = np.fromiter((row[1] for row in rows), dtype=np.float64, count=n)
+    lons = np.fromiter((row[2] for row in rows), dtype=np.float64, count=n)
+    if NUMBA_AVAILABLE and n >= _NUMBA_MIN_ROWS:
+        distances = _haversine_nb(float(latitude), float(longitude), lats, lons)
+    else:
+        distances = _haversine_np(latitude, longitude, lats, lons)
+
+    if radius_km is not None:
+        hits = np.flatnonzero(distances <= radius_km)
+    else:
+        hits = np.arange(n)
 
-    lat1_rad = math.radians(lat1)
-    lat2_rad = math.radians(lat2)
-    delta_lat = math.radians(lat2 - lat1)
-    delta_lon = math.radians(lon2 - lon1)
+    # Stable sort keeps query order for equal distances
+    hits = hits[np.argsort(distances[hits], kind="stable")]
+    if count is not None:
+        hits = hits[:count]
 
-    a = (math.sin(delta_lat / 2) ** 2 +
-         math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon / 2) ** 2)
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    return [(rows[i][0], float(distances[i])) for i in hits]
 
-    return R * c
+
+# Whether the SQLite build exposes math functions (sin, cos, acos, radians);
+# probed once on first use since it depends on how SQLite was compiled
+_sql_math_available: Optional[bool] = None
+
+
+def _has_sql_math(db: Session) -> bool:
+    """Check whether the database supports SQL math functions"""
+    global _sql_math_available
+    if _sql_math_available is None:
+        try:
+            db.execute(select(func.acos(func.radians(0.0))))
+            _sql_math_available = True
+        except OperationalError:
+            _sql_math_available = False
+    return _sql_math_available
+
+
+def _fields_with_distance(
+    db: Session,
+    ranked: List[Tuple[str, float]]
+) -> List[Tuple[OilField, float]]:
+    """Fetch OilField rows for ranked (field_id, distance_km) pairs, preserving order"""
+    if not ranked:
+        return []
+
+    # The statement eager-loads the one-to-one location so callers don't
+    # issue a SELECT per field
+    fields = db.execute(
+        _fields_by_ids_stmt, {"field_ids": [field_id for field_id, _ in ranked]}
+    ).scalars().all()
+    fields_by_id = {field.field_id: field for field in fields}
+
+    return [
+        (fields_by_id[field_id], distance)
+        for field_id, distance in ranked
+        if field_id in fields_by_id
+    ]
 
 
 def get_fields_near_location(
@@ -89,23 +369,17 @@ def get_fields_near_location(
     Get all fields within radius_km of a coordinate
     Returns list of (field, distance_km) tuples sorted by distance
     """
-    fields_with_distance = []
+    # Bounding box lets SQLite use idx_coordinates to shortlist candidates
+    min_lat, max_lat, min_lon, max_lon = _bounding_box(latitude, longitude, radius_km)
+    stmt = select(FieldLocation.field_id, FieldLocation.latitude, FieldLocation.longitude).where(
+        FieldLocation.latitude.between(min_lat, max_lat)
+    )
+    if min_lon is not None:
+        stmt = stmt.where(FieldLocation.longitude.between(min_lon, max_lon))
+    rows = db.execute(stmt).all()
 
-    # Get all fields with locations
-    fields = db.query(OilField).join(FieldLocation).all()
-
-    for field in fields:
-        if field.location:
-            distance = haversine_distance(
-                latitude, longitude,
-                field.location.latitude, field.location.longitude
-            )
-            if distance <= radius_km:
-                fields_with_distance.append((field, distance))
-
-    # Sort by distance
-    fields_with_distance.sort(key=lambda x: x[1])
-    return fields_with_distance
+    ranked = _rank_by_distance(rows, latitude, longitude, radius_km=radius_km)
+    return _fields_with_distance(db, ranked)
 
 
 def get_nearest_fields(
@@ -118,20 +392,30 @@ def get_nearest_fields(
     Get the N nearest fields to a coordinate
     Returns list of (field, distance_km) tuples
     """
-    all_fields = db.query(OilField).join(FieldLocation).all()
+    if _has_sql_math(db):
+        # Spherical law of cosines in SQL so only `count` rows come back;
+        # the cosine is clamped to [-1, 1] to guard acos against rounding
+        lat_rad = math.radians(latitude)
+        cos_angle = (
+            math.sin(lat_rad) * func.sin(func.radians(FieldLocation.latitude)) +
+            math.cos(lat_rad) * func.cos(func.radians(FieldLocation.latitude)) *
+            func.cos(func.radians(FieldLocation.longitude) - math.radians(longitude))
+        )
+        distance = (_EARTH_RADIUS_KM * func.acos(func.min(1.0, func.max(-1.0, cos_angle)))).label("distance_km")
 
-    fields_with_distance = []
-    for field in all_fields:
-        if field.location:
-            distance = haversine_distance(
-                latitude, longitude,
-                field.location.latitude, field.location.longitude
-            )
-            fields_with_distance.append((field, distance))
+        rows = db.execute(
+            select(FieldLocation.field_id, distance)
+            .order_by(distance, FieldLocation.id)
+            .limit(count)
+        ).all()
+        ranked = [(field_id, float(distance_km)) for field_id, distance_km in rows]
+    else:
+        rows = db.execute(
+            select(FieldLocation.field_id, FieldLocation.latitude, FieldLocation.longitude)
+        ).all()
+        ranked = _rank_by_distance(rows, latitude, longitude, count=count)
 
-    # Sort and return top N
-    fields_with_distance.sort(key=lambda x: x[1])
-    return fields_with_distance[:count]
+    return _fields_with_distance(db, ranked)
 
 
 # ===== Platform Queries =====
@@ -146,22 +430,30 @@ def get_platforms_by_type(db: Session, platform_type: str) -> List[Platform]:
     return db.query(Platform).filter(Platform.platform_type == platform_type).all()
 
 
+def iter_operational_platforms(
+    db: Session,
+    batch_size: int = STREAM_BATCH_SIZE
+) -> ScalarResult[Platform]:
+    """Stream operational platforms in batches"""
+    return _stream(db, select(Platform).where(Platform.operational == True), batch_size)
+
+
 def get_operational_platforms(db: Session) -> List[Platform]:
     """Get all operational platforms"""
-    return db.query(Platform).filter(Platform.operational == True).all()
+    return iter_operational_platforms(db).all()
 
 
 # ===== Field Relationship Queries =====
 
 def get_satellite_fields(db: Session, hub_field_id: str) -> List[OilField]:
     """Get all satellite fields connected to a hub field"""
-    relationships = db.query(FieldRelationship).filter(
+    return db.query(OilField).join(
+        FieldRelationship,
+        OilField.field_id == FieldRelationship.satellite_field_id
+    ).filter(
         FieldRelationship.hub_field_id == hub_field_id
     ).all()
 
-    satellite_ids = [r.satellite_field_id for r in relationships]
-    return db.query(OilField).filter(OilField.field_id.in_(satellite_ids)).all()
-
 
 def get_hub_field(db: Session, satellite_field_id: str) -> Optional[OilField]:
     """Get the hub field for a satellite field"""
@@ -181,15 +473,19 @@ def get_field_network(db: Session, field_id: str) -> dict:
     Get complete network of connected fields (hub and all satellites)
     Returns dict with hub field and list of satellite fields
     """
-    field = get_field_by_id(db, field_id)
+    # Load both sides of the hub-satellite graph in batched SELECTs
+    field = db.query(OilField).options(
+        selectinload(OilField.satellites).selectinload(FieldRelationship.satellite_field),
+        selectinload(OilField.hub_connections).selectinload(FieldRelationship.hub_field)
+    ).filter(OilField.field_id == field_id).first()
     if not field:
         return None
 
     # Check if this field is a hub
-    satellites = get_satellite_fields(db, field_id)
+    satellites = [r.satellite_field for r in field.satellites]
 
     # Check if this field is a satellite
-    hub = get_hub_field(db, field_id)
+    hub = field.hub_connections[0].hub_field if field.hub_connections else None
 
     return {
         "field": field,
@@ -212,6 +508,28 @@ def get_cable_routes_for_field(db: Session, field_id: str) -> List[CableRoute]:
     ).all()
 
 
+def _cables_needing_inspection_filter(cutoff_date: datetime):
+    """SQL filter for cables never inspected or last inspected before cutoff_date"""
+    return and_(
+        CableRoute.inspection_required == True,
+        or_(
+            CableRoute.last_inspection_date == None,
+            CableRoute.last_inspection_date < cutoff_date
+        )
+    )
+
+
+def get_cable_routes(
+    db: Session,
+    operational: Optional[bool] = None
+) -> List[CableRoute]:
+    """Get all cable routes, optionally only those with a given operational status"""
+    stmt = select(CableRoute)
+    if operational is not None:
+        stmt = stmt.where(CableRoute.operational == operational)
+    return db.execute(stmt).scalars().all()
+
+
 def get_cables_needing_inspection(
     db: Session,
     days_since_last_inspection: int = 180
@@ -220,22 +538,16 @@ def get_cables_needing_inspection(
     Get cables that need inspection
     (no inspection or last inspection older than specified days)
     """
-    cutoff_date = datetime.utcnow() - timedelta(days=days_since_last_inspection)
+    cutoff_date = datetime.now(timezone.utc) - timedelta(days=days_since_last_inspection)
 
     return db.query(CableRoute).filter(
-        and_(
-            CableRoute.inspection_required == True,
-            or_(
-                CableRoute.last_inspection_date == None,
-                CableRoute.last_inspection_date < cutoff_date
-            )
-        )
+        _cables_needing_inspection_filter(cutoff_date)
     ).all()
 
 
 def get_cable_route_by_id(db: Session, route_id: str) -> Optional[CableRoute]:
     """Get cable route by route_id"""
-    return db.query(CableRoute).filter(CableRoute.route_id == route_id).first()
+    return db.execute(_cable_route_by_id_stmt, {"route_id": route_id}).scalars().first()
 
 
 # ===== Cable Inspection Queries =====
@@ -251,14 +563,36 @@ def get_inspections_for_cable(
     ).order_by(CableInspection.inspection_date.desc()).limit(limit).all()
 
 
+def get_inspections_for_route(
+    db: Session,
+    route_id: str,
+    limit: int = 50
+) -> List[CableInspection]:
+    """Get inspection history for a cable route by its route_id"""
+    return db.execute(
+        _inspections_for_route_stmt, {"route_id": route_id, "limit": limit}
+    ).scalars().all()
+
+
 def get_latest_inspection(
     db: Session,
     cable_route_id: int
 ) -> Optional[CableInspection]:
     """Get most recent inspection for a cable route"""
-    return db.query(CableInspection).filter(
-        CableInspection.cable_route_id == cable_route_id
-    ).order_by(CableInspection.inspection_date.desc()).first()
+    return db.execute(
+        _latest_inspection_stmt, {"cable_route_id": cable_route_id}
+    ).scalars().first()
+
+
+def iter_inspections_by_condition(
+    db: Session,
+    condition: str,
+    batch_size: int = STREAM_BATCH_SIZE
+) -> ScalarResult[CableInspection]:
+    """Stream inspections with a specific condition rating in batches"""
+    return _stream(
+        db, select(CableInspection).where(CableInspection.condition == condition), batch_size
+    )
 
 
 def get_inspections_by_condition(
@@ -266,9 +600,21 @@ def get_inspections_by_condition(
     condition: str
 ) -> List[CableInspection]:
     """Get all inspections with a specific condition rating"""
-    return db.query(CableInspection).filter(
-        CableInspection.condition == condition
-    ).all()
+    return iter_inspections_by_condition(db, condition).all()
+
+
+def get_latest_inspections(
+    db: Session,
+    limit: int = 100,
+    condition: Optional[str] = None
+) -> List[CableInspection]:
+    """Get the most recent inspections, optionally only those with a specific condition rating"""
+    stmt = select(CableInspection)
+    if condition is not None:
+        stmt = stmt.where(CableInspection.condition == condition)
+    return db.execute(
+        stmt.order_by(CableInspection.inspection_date.desc()).limit(limit)
+    ).scalars().all()
 
 
 def get_recent_inspections(
@@ -277,13 +623,159 @@ def get_recent_inspections(
     limit: int = 100
 ) -> List[CableInspection]:
     """Get recent inspections within the last N days"""
-    cutoff_date = datetime.utcnow() - timedelta(days=days)
+    cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
 
     return db.query(CableInspection).filter(
         CableInspection.inspection_date >= cutoff_date
     ).order_by(CableInspection.inspection_date.desc()).limit(limit).all()
 
 
+# Below this many points a KD-tree query costs more than a full haversine pass
+_KDTREE_MIN_POINTS = 512
+
+
+class _CoordinateSnapshot:
+    """
+    In-memory inspection coordinates, stored in radians with cos(latitude)
+    precomputed, so a nearby search is one NumPy pass with no SQL scan.
+    Large snapshots also carry a KD-tree over ECEF coordinates so a search
+    only computes haversine for points inside the query sphere.
+    """
+    __slots__ = ("signature", "ids", "lats_rad", "cos_lats", "lons_rad", "kdtree")
+
+    def __init__(self, signature: Tuple[Any, ...], rows: Sequence[Any]):
+        n = len(rows)
+        self.signature = signature
+        self.ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=n)
+        self.lats_rad = np.radians(np.fromiter((row[1] for row in rows), dtype=np.float64, count=n))
+        self.lons_rad = np.radians(np.fromiter((row[2] for row in rows), dtype=np.float64, count=n))
+        self.cos_lats = np.cos(self.lats_rad)
+
+        self.kdtree = None
+        if SCIPY_AVAILABLE and n >= _KDTREE_MIN_POINTS:
+            xyz = np.column_stack((
+                self.cos_lats * np.cos(self.lons_rad),
+                self.cos_lats * np.sin(self.lons_rad),
+                np.sin(self.lats_rad),
+            ))
+            xyz *= _EARTH_RADIUS_KM
+            self.kdtree = cKDTree(xyz)
+
+    def distances_from(self, latitude: float, longitude: float, index: Optional[np.ndarray] = None) -> np.ndarray:
+        """Haversine distance in kilometers from a coordinate to snapshot points (all, or those in index)"""
+        lats_rad, cos_lats, lons_rad = self.lats_rad, self.cos_lats, self.lons_rad
+        if index is not None:
+            lats_rad, cos_lats, lons_rad = lats_rad[index], cos_lats[index], lons_rad[index]
+
+        lat0_rad = latitude * _DEG_TO_RAD
+        sin_dlat = np.sin((lats_rad - lat0_rad) * 0.5)
+        sin_dlon = np.sin((lons_rad - longitude * _DEG_TO_RAD) * 0.5)
+
+        a = sin_dlat * sin_dlat + math.cos(lat0_rad) * cos_lats * sin_dlon * sin_dlon
+
+        return _EARTH_DIAMETER_KM * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+
+    def within(self, latitude: float, longitude: float, radius_km: float) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Snapshot positions within radius_km of a coordinate and their distances,
+        nearest first (ties keep id order)
+        """
+        if self.kdtree is not None and radius_km < math.pi * _EARTH_RADIUS_KM:
+            lat0_rad = latitude * _DEG_TO_RAD
+            lon0_rad = longitude * _DEG_TO_RAD
+            query_xyz = _EARTH_RADIUS_KM * np.array((
+                math.cos(lat0_rad) * math.cos(lon0_rad),
+                math.cos(lat0_rad) * math.sin(lon0_rad),
+                math.sin(lat0_rad),
+            ))
+            # Great-circle radius -> straight-line chord, padded so rounding
+            # never drops a boundary point; haversine below is the exact filter
+            chord_km = _EARTH_DIAMETER_KM * math.sin(max(radius_km, 0.0) / _EARTH_DIAMETER_KM)
+            candidates = np.sort(np.asarray(self.kdtree.query_ball_point(query_xyz, r=chord_km * (1 + 1e-9) + 1e-6), dtype=np.intp))
+            distances = self.distances_from(latitude, longitude, candidates)
+            inside = distances <= radius_km
+            hits, distances = candidates[inside], distances[inside]
+        else:
+            distances = self.distances_from(latitude, longitude)
+            hits = np.flatnonzero(distances <= radius_km)
+            distances = distances[hits]
+
+        order = np.argsort(distances, kind="stable")
+        return hits[order], distances[order]
+
+
+# Process-wide snapshot of inspection coordinates, rebuilt when the table changes
+_inspection_coordinates: Optional[_CoordinateSnapshot] = None
+_inspection_coordinates_lock = threading.Lock()
+
+# Token replaced on every invalidation; next() on a count is atomic, so each
+# invalidation yields a value no earlier snapshot was tagged with
+_invalidation_tokens = count()
+_inspection_coordinates_token = next(_invalidation_tokens)
+
+_inspection_signature_stmt = select(func.count(CableInspection.id), func.max(CableInspection.id))
+
+_inspection_coordinates_stmt = select(
+    CableInspection.id, CableInspection.latitude, CableInspection.longitude
+).where(
+    and_(CableInspection.latitude != None, CableInspection.longitude != None)
+)
+
+
+def invalidate_inspection_coordinates() -> None:
+    """
+    Drop the cached inspection coordinate snapshot
+
+    ORM commits that touch CableInspection rows call this automatically;
+    call it after writing cable_inspections through Core or raw SQL.
+    """
+    global _inspection_coordinates_token
+    _inspection_coordinates_token = next(_invalidation_tokens)
+
+
+@event.listens_for(Session, "after_flush")
+def _note_inspection_writes(session: Session, flush_context: Any) -> None:
+    if any(
+        isinstance(obj, CableInspection)
+        for obj in (*session.new, *session.dirty, *session.deleted)
+    ):
+        session.info["inspections_written"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_inspection_commit(session: Session) -> None:
+    if session.info.pop("inspections_written", False):
+        invalidate_inspection_coordinates()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_inspection_writes(session: Session) -> None:
+    session.info.pop("inspections_written", None)
+
+
+def _get_inspection_coordinates(db: Session) -> _CoordinateSnapshot:
+    """
+    Current coordinate snapshot
+
+    Reloaded after any invalidation (see invalidate_inspection_coordinates)
+    and, for writes from other processes, when the inspection row count or
+    highest id changes. Rebuilds are serialized so concurrent requests share
+    one reload.
+    """
+    global _inspection_coordinates
+    # Read the token before the table, so a commit landing during the
+    # rebuild leaves this snapshot already out of date
+    signature = (_inspection_coordinates_token, *db.execute(_inspection_signature_stmt).one())
+    snapshot = _inspection_coordinates
+    if snapshot is None or snapshot.signature != signature:
+        with _inspection_coordinates_lock:
+            snapshot = _inspection_coordinates
+            if snapshot is None or snapshot.signature != signature:
+                snapshot = _CoordinateSnapshot(signature, db.execute(_inspection_coordinates_stmt).all())
+                _inspection_coordinates = snapshot
+    return snapshot
+
+
 def get_inspections_near_location(
     db: Session,
     latitude: float,
@@ -294,66 +786,66 @@ def get_inspections_near_location(
     Get inspections near a location
     Returns list of (inspection, distance_km) tuples
     """
-    inspections_with_distance = []
+    coordinates = _get_inspection_coordinates(db)
+    hits, distances = coordinates.within(latitude, longitude, radius_km)
+    if not len(hits):
+        return []
 
-    # Get all inspections with coordinates
-    inspections = db.query(CableInspection).filter(
-        and_(
-            CableInspection.latitude != None,
-            CableInspection.longitude != None
-        )
-    ).all()
+    ranked = list(zip(coordinates.ids[hits].tolist(), distances.tolist()))
 
-    for inspection in inspections:
-        distance = haversine_distance(
-            latitude, longitude,
-            inspection.latitude, inspection.longitude
-        )
-        if distance <= radius_km:
-            inspections_with_distance.append((inspection, distance))
+    inspections = db.execute(
+        _inspections_by_ids_stmt, {"ids": [inspection_id for inspection_id, _ in ranked]}
+    ).scalars().all()
+    inspections_by_id = {inspection.id: inspection for inspection in inspections}
 
-    # Sort by distance
-    inspections_with_distance.sort(key=lambda x: x[1])
-    return inspections_with_distance
+    return [
+        (inspections_by_id[inspection_id], distance)
+        for inspection_id, distance in ranked
+        if inspection_id in inspections_by_id
+    ]
 
 
 # ===== Cluster Queries =====
 
 def get_cluster_by_id(db: Session, cluster_id: str) -> Optional[InfrastructureCluster]:
     """Get infrastructure cluster by cluster_id"""
-    return db.query(InfrastructureCluster).filter(
-        InfrastructureCluster.cluster_id == cluster_id
-    ).first()
+    return db.execute(_cluster_by_id_stmt, {"cluster_id": cluster_id}).scalars().first()
 
 
 def get_fields_in_cluster(db: Session, cluster_id: str) -> List[OilField]:
     """Get all fields in a cluster"""
-    members = db.query(ClusterMember).filter(
+    return db.query(OilField).join(
+        ClusterMember,
+        OilField.field_id == ClusterMember.field_id
+    ).filter(
         ClusterMember.cluster_id == cluster_id
     ).all()
 
-    field_ids = [m.field_id for m in members]
-    return db.query(OilField).filter(OilField.field_id.in_(field_ids)).all()
-
 
 def get_clusters_for_field(db: Session, field_id: str) -> List[InfrastructureCluster]:
     """Get all clusters a field belongs to"""
-    members = db.query(ClusterMember).filter(
+    return db.query(InfrastructureCluster).join(
+        ClusterMember,
+        InfrastructureCluster.cluster_id == ClusterMember.cluster_id
+    ).filter(
         ClusterMember.field_id == field_id
     ).all()
 
-    cluster_ids = [m.cluster_id for m in members]
-    return db.query(InfrastructureCluster).filter(
-        InfrastructureCluster.cluster_id.in_(cluster_ids)
-    ).all()
-
 
 # ===== Statistics Queries =====
 
 def get_field_statistics(db: Session) -> dict:
     """Get overall statistics about oil fields"""
-    total_fields = db.query(OilField).count()
-    producing_fields = db.query(OilField).filter(OilField.status == "producing").count()
+    # Totals are computed with conditional aggregation, one pass per table
+    total_fields, producing_fields = db.query(
+        func.count(OilField.id),
+        func.sum(case((OilField.status == "producing", 1), else_=0))
+    ).one()
+
+    total_platforms, operational_platforms = db.query(
+        func.count(Platform.id),
+        func.sum(case((Platform.operational == True, 1), else_=0))
+    ).one()
 
     by_sea_area = db.query(
         OilField.sea_area,
@@ -363,15 +855,15 @@ def get_field_statistics(db: Session) -> dict:
     by_operator = db.query(
         OilField.operator,
         func.count(OilField.id)
-    ).group_by(OilField.operator).order_by(func.count(OilField.id).desc()).all()
+    ).group_by(OilField.operator).order_by(func.count(OilField.id).desc()).limit(10).all()
 
     return {
         "total_fields": total_fields,
-        "producing_fields": producing_fields,
+        "producing_fields": producing_fields or 0,
         "by_sea_area": {area: count for area, count in by_sea_area},
-        "by_operator": {operator: count for operator, count in by_operator[:10]},
-        "total_platforms": db.query(Platform).count(),
-        "operational_platforms": db.query(Platform).filter(Platform.operational == True).count()
+        "by_operator": {operator: count for operator, count in by_operator},
+        "total_platforms": total_platforms,
+        "operational_platforms": operational_platforms or 0
     }
 
 
@@ -379,7 +871,10 @@ def get_cable_statistics(db: Session) -> dict:
     """Get statistics about cable routes and inspections"""
     total_cables = db.query(CableRoute).count()
     operational_cables = db.query(CableRoute).filter(CableRoute.operational == True).count()
-    cables_need_inspection = len(get_cables_needing_inspection(db, days_since_last_inspection=180))
+    cutoff_date = datetime.now(timezone.utc) - timedelta(days=180)
+    cables_need_inspection = db.scalar(
+        select(func.count(CableRoute.id)).where(_cables_needing_inspection_filter(cutoff_date))
+    )
 
     total_inspections = db.query(CableInspection).count()
 
@@ -401,7 +896,7 @@ def get_cable_statistics(db: Session) -> dict:
 
 def get_profile(db: Session, profile_key: str = "default_profile") -> Optional[ClientProfile]:
     """Get client profile by profile_key"""
-    return db.query(ClientProfile).filter(ClientProfile.profile_key == profile_key).first()
+    return db.execute(_profile_by_key_stmt, {"profile_key": profile_key}).scalars().first()
 
 
 def get_default_profile(db: Session) -> Optional[ClientProfile]:
@@ -0,0 +1,80 @@
+"""
+Custom column types for the database models
+"""
+
+from datetime import datetime, timezone
+from typing import Optional, Sequence
+
+from sqlalchemy.types import DateTime, SmallInteger, TypeDecorator
+
+
+class CodedEnum(TypeDecorator):
+    """
+    Stores one of a fixed set of string values as a small integer code
+
+    The Python side keeps working with the strings (or str Enum members), so
+    queries, inserts and API responses are unchanged; only the stored value
+    and its indexes shrink. Codes are positions in `values`, so new values
+    must be appended, never inserted or reordered.
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    # Code for values outside the set: comparisons against it match no rows
+    # and inserts are rejected by the column's CHECK constraint
+    INVALID_CODE = -1
+
+    def __init__(self, values: Sequence[str]):
+        super().__init__()
+        self.values = tuple(values)
+        self._codes = {value: code for code, value in enumerate(self.values)}
+
+    def check_sql(self, column_name: str) -> str:
+        """SQL expression for a CHECK constraint restricting the column to valid codes"""
+        return f"{column_name} BETWEEN 0 AND {len(self.values) - 1}"
+
+    def to_code(self, value) -> int:
+        """Code for a string value (or str Enum member); INVALID_CODE if unknown"""
+        return self._codes.get(getattr(value, "value", value), self.INVALID_CODE)
+
+    def process_bind_param(self, value, dialect) -> Optional[int]:
+        if value is None:
+            return None
+        return self.to_code(value)
+
+    def process_result_value(self, value, dialect) -> Optional[str]:
+        if value is None:
+            return None
+        # Rows written before the column was coded still hold the string
+        if isinstance(value, str) and value in self._codes:
+            return value
+        if isinstance(value, int) and 0 <= value < len(self.values):
+            return self.values[value]
+        raise ValueError(
+            f"Unexpected stored value {value!r} for coded column with values {self.values}; "
+            "run init_db() to upgrade databases created before the column was coded"
+        )
+
+
+class UTCDateTime(TypeDecorator):
+    """
+    Timestamp stored as naive UTC and read back as timezone-aware UTC
+
+    SQLite has no time zone support, so aware values are converted to UTC
+    and stored without an offset, exactly like existing rows and SQLite's
+    CURRENT_TIMESTAMP; naive values are taken to already be UTC.
+    """
+
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect) -> Optional[datetime]:
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    def process_result_value(self, value, dialect) -> Optional[datetime]:
+        if value is None:
+            return None
+        return value.replace(tzinfo=timezone.utc)
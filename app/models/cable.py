@@ -2,11 +2,17 @@
 Cable models for underwater cable tracking and inspection
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import partial
 from enum import Enum
 
+from .inspection import NESTED_MODELS, DefectLocation
+
+
+_UTCNOW = partial(datetime.now, timezone.utc)
+
 
 class CableCondition(str, Enum):
     """Cable condition assessment levels"""
@@ -26,6 +32,15 @@ class IssueSeverity(str, Enum):
     CRITICAL = "critical"
 
 
+_EXAMPLE_CABLE_LOCATION = {
+    "id": "loc_001",
+    "latitude": 69.3296,
+    "longitude": 16.1274,
+    "depth": 150.0,
+    "timestamp": "2025-01-15T10:30:00Z"
+}
+
+
 class CableLocation(BaseModel):
     """Geographic location of a cable segment or inspection point"""
     id: str = Field(..., description="Unique identifier for this location")
@@ -33,18 +48,22 @@ class CableLocation(BaseModel):
     longitude: float = Field(..., ge=-180, le=180, description="Longitude coordinate")
     depth: Optional[float] = Field(None, description="Depth in meters (positive = below sea level)")
     altitude: Optional[float] = Field(None, description="Altitude in meters")
-    timestamp: datetime = Field(default_factory=datetime.utcnow)
+    timestamp: datetime = Field(default_factory=_UTCNOW)
+
+    model_config = ConfigDict(
+        frozen=True,
+        extra="forbid",
+        json_schema_extra={"example": _EXAMPLE_CABLE_LOCATION}
+    )
+
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "id": "loc_001",
-                "latitude": 69.3296,
-                "longitude": 16.1274,
-                "depth": 150.0,
-                "timestamp": "2025-01-15T10:30:00Z"
-            }
-        }
+_EXAMPLE_CABLE_SEGMENT = {
+    "id": "cable_seg_001",
+    "name": "North Sea Segment A",
+    "cable_type": "fiber_optic",
+    "length_meters": 5000,
+    "condition": "good"
+}
 
 
 class CableSegment(BaseModel):
@@ -60,16 +79,22 @@ class CableSegment(BaseModel):
     condition: CableCondition = CableCondition.UNKNOWN
     notes: Optional[str] = None
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "id": "cable_seg_001",
-                "name": "North Sea Segment A",
-                "cable_type": "fiber_optic",
-                "length_meters": 5000,
-                "condition": "good"
-            }
-        }
+    model_config = ConfigDict(json_schema_extra={"example": _EXAMPLE_CABLE_SEGMENT})
+
+
+_EXAMPLE_INSPECTION_POINT = {
+    "id": "insp_001",
+    "cable_segment_id": "cable_seg_001",
+    "location": {
+        "id": "loc_001",
+        "latitude": 69.3296,
+        "longitude": 16.1274,
+        "depth": 150.0
+    },
+    "condition": "fair",
+    "detected_issues": ["minor corrosion", "biological growth"],
+    "confidence_score": 0.85
+}
 
 
 class InspectionPoint(BaseModel):
@@ -81,26 +106,20 @@ class InspectionPoint(BaseModel):
     condition: CableCondition = CableCondition.UNKNOWN
     detected_issues: List[str] = Field(default_factory=list)
     confidence_score: Optional[float] = Field(None, ge=0, le=1)
-    inspection_date: datetime = Field(default_factory=datetime.utcnow)
+    inspection_date: datetime = Field(default_factory=_UTCNOW)
     inspector: Optional[str] = None
     notes: Optional[str] = None
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "id": "insp_001",
-                "cable_segment_id": "cable_seg_001",
-                "location": {
-                    "id": "loc_001",
-                    "latitude": 69.3296,
-                    "longitude": 16.1274,
-                    "depth": 150.0
-                },
-                "condition": "fair",
-                "detected_issues": ["minor corrosion", "biological growth"],
-                "confidence_score": 0.85
-            }
-        }
+    model_config = ConfigDict(json_schema_extra={"example": _EXAMPLE_INSPECTION_POINT})
+
+
+_EXAMPLE_DETECTED_ISSUE = {
+    "issue_type": "corrosion",
+    "severity": "medium",
+    "description": "Surface corrosion detected on cable sheath",
+    "confidence": 0.82,
+    "recommended_action": "Schedule maintenance within 3 months"
+}
 
 
 class DetectedIssue(BaseModel):
@@ -108,23 +127,28 @@ class DetectedIssue(BaseModel):
     issue_type: str = Field(..., description="Type of issue (corrosion, damage, wear, etc.)")
     severity: IssueSeverity
     description: str
-    location_on_image: Optional[dict] = Field(
+    location_on_image: Optional[DefectLocation] = Field(
         None,
-        description="Bounding box or coordinates of issue in image {x, y, width, height}"
+        description="Bounding box of issue in image {x, y, width, height}"
     )
     confidence: float = Field(..., ge=0, le=1)
     recommended_action: Optional[str] = None
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "issue_type": "corrosion",
-                "severity": "medium",
-                "description": "Surface corrosion detected on cable sheath",
-                "confidence": 0.82,
-                "recommended_action": "Schedule maintenance within 3 months"
-            }
-        }
+    model_config = ConfigDict(json_schema_extra={"example": _EXAMPLE_DETECTED_ISSUE})
+
+
+_EXAMPLE_INSPECTION_REPORT = {
+    "id": "report_001",
+    "cable_segment_id": "cable_seg_001",
+    "overall_condition": "good",
+    "total_issues_found": 3,
+    "critical_issues": 0,
+    "high_severity_issues": 1,
+    "recommendations": [
+        "Monitor corrosion areas in sector B",
+        "Schedule full inspection in 6 months"
+    ]
+}
 
 
 class InspectionReport(BaseModel):
@@ -137,22 +161,17 @@ class InspectionReport(BaseModel):
     critical_issues: int = 0
     high_severity_issues: int = 0
     recommendations: List[str] = Field(default_factory=list)
-    inspection_date: datetime = Field(default_factory=datetime.utcnow)
+    inspection_date: datetime = Field(default_factory=_UTCNOW)
     inspector: Optional[str] = None
     summary: Optional[str] = None
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "id": "report_001",
-                "cable_segment_id": "cable_seg_001",
-                "overall_condition": "good",
-                "total_issues_found": 3,
-                "critical_issues": 0,
-                "high_severity_issues": 1,
-                "recommendations": [
-                    "Monitor corrosion areas in sector B",
-                    "Schedule full inspection in 6 months"
-                ]
-            }
-        }
+    model_config = ConfigDict(json_schema_extra={"example": _EXAMPLE_INSPECTION_REPORT})
+
+
+# Register nested cable models for trusted construction via fast_build
+NESTED_MODELS.update({
+    CableSegment: {"start_location": CableLocation, "end_location": CableLocation},
+    InspectionPoint: {"location": CableLocation},
+    DetectedIssue: {"location_on_image": DefectLocation},
+    InspectionReport: {"inspection_points": InspectionPoint},
+})
@@ -3,12 +3,21 @@ ML Inference module for underwater cable analysis
 Integrates with Ollama and other ML frameworks
 """
 
-import ollama
-from PIL import Image
-import io
-import base64
-from typing import Dict, List, Optional
-import numpy as np
+import asyncio
+import re
+from functools import cache
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
+
+# ollama, PIL and numpy are imported on first use to keep startup fast
+if TYPE_CHECKING:
+    import numpy as np
+
+
+@cache
+def _ollama():
+    """Import the ollama client library on first use"""
+    import ollama
+    return ollama
 
 
 class CableAnalysisModel:
@@ -17,14 +26,49 @@ class CableAnalysisModel:
     Supports Ollama vision models and custom ML models
     """
 
-    def __init__(self, model_name: str = "llama3.2-vision:11b"):
+    # Most severe first: when a response mentions several conditions the
+    # worst one wins, so a damaged cable is never reported as "good"
+    CONDITION_PRIORITY = ("critical", "poor", "fair", "good", "excellent")
+    ISSUES = (
+        "corrosion", "damage", "wear", "biological growth",
+        "crack", "tear", "degradation", "fouling"
+    )
+    RECOMMENDATION_STARTERS = ("recommend", "should", "suggest", "inspect", "replace", "repair")
+
+    # Compiled once: each pattern replaces a per-keyword scan of the response.
+    # Lookahead captures keep overlapping keywords matchable at every position.
+    _CONDITION_RE = re.compile(f"(?=({'|'.join(CONDITION_PRIORITY)}))")
+    _ISSUE_RE = re.compile(f"(?=({'|'.join(ISSUES)}))")
+    # The group excludes surrounding whitespace, so matches need no strip()
+    _RECOMMENDATION_RE = re.compile(
+        rf"^[^\S\n]*(.*?(?:{'|'.join(RECOMMENDATION_STARTERS)}).*?)[^\S\n]*$",
+        re.IGNORECASE | re.MULTILINE
+    )
+
+    # Concurrent Ollama requests issued by analyze_images
+    MAX_CONCURRENT_REQUESTS = 8
+
+    # Caps KV-cache size and response length for vision calls
+    VISION_OPTIONS = {"num_ctx": 2048, "num_predict": 512}
+
+    # How long Ollama keeps a model resident after each request
+    KEEP_ALIVE = "24h"
+
+    def __init__(
+        self,
+        model_name: str = "llama3.2-vision:11b",
+        text_model_name: str = "llama3.2:3b"
+    ):
         """
         Initialize the analysis model
 
         Args:
             model_name: Name of the Ollama model to use for vision analysis
+            text_model_name: Name of the Ollama model to use when no image is attached
         """
         self.model_name = model_name
+        self.text_model_name = text_model_name
+        self._client = None
         self.analysis_prompt = """
         You are an expert in underwater cable inspection and maintenance.
         Analyze this underwater cable image and provide:
@@ -37,28 +81,72 @@ class CableAnalysisModel:
         Be specific and concise in your analysis.
         """
 
-    async def analyze_image(self, image_path: str) -> Dict:
+    @property
+    def client(self):
+        """Ollama async client, created on first use and reused so connections stay alive"""
+        if self._client is None:
+            self._client = _ollama().AsyncClient()
+        return self._client
+
+    async def warmup(self) -> None:
+        """
+        Load the vision model into memory ahead of the first request
+
+        An empty prompt makes Ollama load the weights without generating
+        tokens; KEEP_ALIVE keeps them resident between requests.
+        """
+        await self.client.generate(
+            model=self.model_name,
+            prompt="",
+            keep_alive=self.KEEP_ALIVE
+        )
+
+    async def analyze_image(self, image_path: Optional[str] = None) -> Dict:
         """
         Analyze an underwater cable image using Ollama vision model
 
         Args:
-            image_path: Path to the image file
+            image_path: Path to the image file. When omitted, the prompt is
+                sent to the text-only model and the vision encoder is skipped.
+
+        Returns:
+            Dictionary containing analysis results
+        """
+        return await self._analyze(image_path)
+
+    async def analyze_bytes(self, data: bytes) -> Dict:
+        """
+        Analyze an encoded (JPEG/PNG) underwater cable image held in memory
+
+        The bytes are handed to Ollama as-is, so nothing touches the disk.
+
+        Args:
+            data: Encoded image bytes
 
         Returns:
             Dictionary containing analysis results
         """
+        return await self._analyze(data)
+
+    async def _analyze(self, image: Union[str, bytes, None]) -> Dict:
+        """Run the vision (or text-only, when image is None) analysis"""
         try:
-            # Use Ollama for vision-based analysis
-            response = ollama.chat(
-                model=self.model_name,
-                messages=[
-                    {
-                        'role': 'user',
-                        'content': self.analysis_prompt,
-                        'images': [image_path]
-                    }
-                ]
-            )
+            message = {'role': 'user', 'content': self.analysis_prompt}
+            if image is None:
+                response = await self.client.chat(
+                    model=self.text_model_name,
+                    messages=[message],
+                    keep_alive=self.KEEP_ALIVE
+                )
+            else:
+                # Use Ollama for vision-based analysis
+                message['images'] = [image]
+                response = await self.client.chat(
+                    model=self.model_name,
+                    messages=[message],
+                    options=self.VISION_OPTIONS,
+                    keep_alive=self.KEEP_ALIVE
+                )
 
             # Parse the response
             analysis_text = response['message']['content']
@@ -75,6 +163,25 @@ class CableAnalysisModel:
                 "message": "Failed to analyze image with ML model"
             }
 
+    async def analyze_images(self, images: List[Union[str, bytes]]) -> List[Dict]:
+        """
+        Analyze several underwater cable images concurrently, with at most
+        MAX_CONCURRENT_REQUESTS Ollama requests in flight
+
+        Args:
+            images: Image file paths or encoded image bytes
+
+        Returns:
+            Analysis results in the same order as images
+        """
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+
+        async def analyze_one(image: Union[str, bytes]) -> Dict:
+            async with semaphore:
+                return await self._analyze(image)
+
+        return await asyncio.gather(*(analyze_one(image) for image in images))
+
     def _parse_analysis_response(self, analysis_text: str) -> Dict:
         """
         Parse the LLM response into structured data
@@ -94,36 +201,19 @@ class CableAnalysisModel:
             "recommendations": []
         }
 
-        # Extract condition
+        # Extract condition (most severe match wins)
         text_lower = analysis_text.lower()
-        if "excellent" in text_lower:
-            result["cable_condition"] = "excellent"
-        elif "good" in text_lower:
-            result["cable_condition"] = "good"
-        elif "fair" in text_lower:
-            result["cable_condition"] = "fair"
-        elif "poor" in text_lower:
-            result["cable_condition"] = "poor"
-        elif "critical" in text_lower:
-            result["cable_condition"] = "critical"
+        found_conditions = frozenset(self._CONDITION_RE.findall(text_lower))
+        result["cable_condition"] = next(
+            (c for c in self.CONDITION_PRIORITY if c in found_conditions), "unknown"
+        )
 
         # Extract common issues
-        issues = [
-            "corrosion", "damage", "wear", "biological growth",
-            "crack", "tear", "degradation", "fouling"
-        ]
-
-        for issue in issues:
-            if issue in text_lower:
-                result["detected_issues"].append(issue)
-
-        # Extract recommendations (lines starting with common indicators)
-        lines = analysis_text.split('\n')
-        for line in lines:
-            line_lower = line.lower().strip()
-            if any(starter in line_lower for starter in ["recommend", "should", "suggest", "inspect", "replace", "repair"]):
-                if line.strip():
-                    result["recommendations"].append(line.strip())
+        found_issues = frozenset(self._ISSUE_RE.findall(text_lower))
+        result["detected_issues"] = [issue for issue in self.ISSUES if issue in found_issues]
+
+        # Extract recommendations (lines containing common indicators)
+        result["recommendations"] = self._RECOMMENDATION_RE.findall(analysis_text)
 
         return result
 
@@ -146,7 +236,7 @@ class CableAnalysisModel:
             "message": "Custom model integration pending"
         }
 
-    def preprocess_image(self, image_path: str, target_size: tuple = (224, 224)) -> np.ndarray:
+    def preprocess_image(self, image_path: str, target_size: tuple = (224, 224)) -> "np.ndarray":
         """
         Preprocess image for ML model input
 
@@ -155,9 +245,22 @@ class CableAnalysisModel:
             target_size: Target size for the image
 
         Returns:
-            Preprocessed image as numpy array
+            Preprocessed RGB image as float32 HxWx3 numpy array
         """
-        img = Image.open(image_path)
-        img = img.resize(target_size)
-        img_array = np.array(img) / 255.0  # Normalize to [0, 1]
+        import numpy as np
+        from PIL import Image
+
+        with Image.open(image_path) as img:
+            # JPEGs decode straight at a reduced scale (no-op for other formats)
+            img.draft('RGB', target_size)
+            # reducing_gap box-reduces by an integer factor first, leaving
+            # bilinear to filter only the final < 2x step
+            img = img.convert('RGB').resize(
+                target_size, Image.Resampling.BILINEAR, reducing_gap=2.0
+            )
+        pixels = np.asarray(img, dtype=np.uint8)
+
+        # Normalize to [0, 1] in one float32 pass (no float64 temporary)
+        img_array = np.empty(pixels.shape, dtype=np.float32)
+        np.multiply(pixels, np.float32(1.0 / 255.0), out=img_array, casting='unsafe')
         return img_array
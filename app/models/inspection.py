@@ -3,10 +3,25 @@ AI Visual Inspection Models for Pipeline and Subsea Asset Inspection
 Supports frontend requirements from AI_VISUAL_INSPECTION_IMPLEMENTATION.md
 """
 
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict
-from datetime import datetime
-from enum import Enum
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, model_validator
+from typing import Optional, List, Dict, Iterable
+from datetime import datetime, timezone
+from functools import partial
+from enum import Enum, IntEnum
+import binascii
+import io
+
+import numpy as np
+from PIL import Image
+
+try:
+    import pybase64 as base64  # SIMD-accelerated drop-in for the stdlib module
+except ImportError:
+    import base64
+
+
+# Timezone-aware replacement for the deprecated datetime.utcnow
+_UTCNOW = partial(datetime.now, timezone.utc)
 
 
 class DefectType(str, Enum):
@@ -29,6 +44,31 @@ class DefectSeverity(str, Enum):
     CRITICAL = "critical"
 
 
+# Integer codes (declaration order, so severity codes rank LOW < CRITICAL)
+# for vectorized voting and ranking over many detections
+DefectTypeCode = IntEnum(
+    "DefectTypeCode", [(t.name, i) for i, t in enumerate(DefectType)]
+)
+DefectSeverityCode = IntEnum(
+    "DefectSeverityCode", [(s.name, i) for i, s in enumerate(DefectSeverity)]
+)
+
+_DEFECT_TYPE_TO_CODE = {t: i for i, t in enumerate(DefectType)}
+_DEFECT_SEVERITY_TO_CODE = {s: i for i, s in enumerate(DefectSeverity)}
+DEFECT_TYPE_FROM_CODE = tuple(DefectType)
+DEFECT_SEVERITY_FROM_CODE = tuple(DefectSeverity)
+
+
+def defect_type_codes(types: Iterable) -> np.ndarray:
+    """Encode defect types (enum members or values) as a uint8 array"""
+    return np.fromiter((_DEFECT_TYPE_TO_CODE[t] for t in types), dtype=np.uint8)
+
+
+def defect_severity_codes(severities: Iterable) -> np.ndarray:
+    """Encode defect severities (enum members or values) as a uint8 array"""
+    return np.fromiter((_DEFECT_SEVERITY_TO_CODE[s] for s in severities), dtype=np.uint8)
+
+
 class AssetCondition(str, Enum):
     """Overall condition assessment"""
     EXCELLENT = "excellent"
@@ -45,6 +85,8 @@ class DefectLocation(BaseModel):
     width: int = Field(..., description="Width of bounding box")
     height: int = Field(..., description="Height of bounding box")
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
 
 class DefectDimensions(BaseModel):
     """Physical dimensions of the defect"""
@@ -52,6 +94,28 @@ class DefectDimensions(BaseModel):
     width: Optional[float] = Field(None, description="Width in mm")
     depth: Optional[float] = Field(None, description="Depth in mm")
 
+    model_config = ConfigDict(frozen=True, extra="forbid")
+
+
+_EXAMPLE_DETECTED_DEFECT = {
+    "id": "defect_001",
+    "type": "corrosion",
+    "severity": "medium",
+    "confidence": 0.96,
+    "location": {
+        "x": 245,
+        "y": 378,
+        "width": 120,
+        "height": 85
+    },
+    "description": "Surface corrosion covering approximately 120mm² area",
+    "dimensions": {
+        "length": 12.5,
+        "width": 8.3,
+        "depth": 2.1
+    }
+}
+
 
 class DetectedDefect(BaseModel):
     """Detailed information about a single detected defect"""
@@ -63,27 +127,27 @@ class DetectedDefect(BaseModel):
     description: str = Field(..., description="Detailed description of defect")
     dimensions: Optional[DefectDimensions] = Field(None, description="Physical dimensions")
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "id": "defect_001",
-                "type": "corrosion",
-                "severity": "medium",
-                "confidence": 0.96,
-                "location": {
-                    "x": 245,
-                    "y": 378,
-                    "width": 120,
-                    "height": 85
-                },
-                "description": "Surface corrosion covering approximately 120mm² area",
-                "dimensions": {
-                    "length": 12.5,
-                    "width": 8.3,
-                    "depth": 2.1
-                }
-            }
+    model_config = ConfigDict(json_schema_extra={"example": _EXAMPLE_DETECTED_DEFECT})
+
+
+_EXAMPLE_ANALYSIS_RESULT = {
+    "overall_condition": "Fair",
+    "confidence": 0.94,
+    "defects_detected": [
+        {
+            "id": "defect_001",
+            "type": "corrosion",
+            "severity": "medium",
+            "confidence": 0.96,
+            "location": {"x": 245, "y": 378, "width": 120, "height": 85},
+            "description": "Surface corrosion covering approximately 120mm² area"
         }
+    ],
+    "recommendations": [
+        "Schedule maintenance within 6 months",
+        "Monitor corrosion progression"
+    ]
+}
 
 
 class AnalysisResult(BaseModel):
@@ -93,27 +157,20 @@ class AnalysisResult(BaseModel):
     defects_detected: List[DetectedDefect] = Field(default_factory=list, description="List of detected defects")
     recommendations: List[str] = Field(default_factory=list, description="AI-generated recommendations")
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "overall_condition": "Fair",
-                "confidence": 0.94,
-                "defects_detected": [
-                    {
-                        "id": "defect_001",
-                        "type": "corrosion",
-                        "severity": "medium",
-                        "confidence": 0.96,
-                        "location": {"x": 245, "y": 378, "width": 120, "height": 85},
-                        "description": "Surface corrosion covering approximately 120mm² area"
-                    }
-                ],
-                "recommendations": [
-                    "Schedule maintenance within 6 months",
-                    "Monitor corrosion progression"
-                ]
-            }
-        }
+    model_config = ConfigDict(json_schema_extra={"example": _EXAMPLE_ANALYSIS_RESULT})
+
+
+_EXAMPLE_ANALYSIS_RESPONSE = {
+    "id": "analysis_12345",
+    "status": "completed",
+    "processed_at": "2025-10-17T12:00:00Z",
+    "result": {
+        "overall_condition": "Fair",
+        "confidence": 0.94,
+        "defects_detected": [],
+        "recommendations": []
+    }
+}
 
 
 class AnalysisResponse(BaseModel):
@@ -123,40 +180,73 @@ class AnalysisResponse(BaseModel):
     processed_at: datetime = Field(..., description="Processing timestamp")
     result: AnalysisResult = Field(..., description="Analysis results")
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "id": "analysis_12345",
-                "status": "completed",
-                "processed_at": "2025-10-17T12:00:00Z",
-                "result": {
-                    "overall_condition": "Fair",
-                    "confidence": 0.94,
-                    "defects_detected": [],
-                    "recommendations": []
-                }
-            }
-        }
+    model_config = ConfigDict(json_schema_extra={"example": _EXAMPLE_ANALYSIS_RESPONSE})
+
+
+def decode_image_data(image_data: str) -> bytes:
+    """Decode base64 image data, stripping any data URL prefix"""
+    if ',' in image_data:
+        image_data = image_data.split(',', 1)[1]
+    return base64.b64decode(image_data)
+
+
+_EXAMPLE_IMAGE_ANALYSIS_REQUEST = {
+    "imageData": "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg==",
+    "timestamp": "2025-10-17T12:00:00Z",
+    "metadata": {
+        "latitude": 60.5,
+        "longitude": 3.5,
+        "depth": 125.5
+    }
+}
 
 
 class ImageAnalysisRequest(BaseModel):
     """Request structure for image analysis from frontend"""
     imageData: str = Field(..., description="Base64 encoded image data")
-    timestamp: datetime = Field(default_factory=datetime.utcnow, description="Upload timestamp")
+    timestamp: datetime = Field(default_factory=_UTCNOW, description="Upload timestamp")
     metadata: Optional[Dict] = Field(None, description="Optional metadata (location, depth, etc.)")
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "imageData": "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg==",
-                "timestamp": "2025-10-17T12:00:00Z",
-                "metadata": {
-                    "latitude": 60.5,
-                    "longitude": 3.5,
-                    "depth": 125.5
-                }
-            }
-        }
+    # Raw image bytes, decoded once during validation
+    _image_bytes: bytes = PrivateAttr(default=b"")
+
+    @model_validator(mode="after")
+    def _decode_image(self) -> "ImageAnalysisRequest":
+        try:
+            self._image_bytes = decode_image_data(self.imageData)
+        except (binascii.Error, ValueError) as e:
+            raise ValueError(f"imageData is not valid base64: {e}")
+        return self
+
+    @property
+    def image_bytes(self) -> bytes:
+        """Decoded image bytes"""
+        return self._image_bytes
+
+    def open_image(self) -> Image.Image:
+        """Open the decoded image with PIL"""
+        return Image.open(io.BytesIO(self._image_bytes))
+
+    def as_array(self) -> np.ndarray:
+        """Decoded image as a NumPy array"""
+        return np.asarray(self.open_image())
+
+    model_config = ConfigDict(json_schema_extra={"example": _EXAMPLE_IMAGE_ANALYSIS_REQUEST})
+
+
+_EXAMPLE_INSPECTION_TASK = {
+    "id": "TASK001",
+    "name": "Pipeline Section A Visual Inspection",
+    "status": "completed",
+    "aiAutomationEnabled": True,
+    "aiConfidenceScore": 0.94,
+    "defectsDetected": 3,
+    "findings": "Minor corrosion detected at 3 locations",
+    "recommendations": [
+        "Schedule maintenance within 6 months",
+        "Monitor corrosion progression"
+    ]
+}
 
 
 class InspectionTask(BaseModel):
@@ -175,19 +265,35 @@ class InspectionTask(BaseModel):
     scheduledDate: Optional[datetime] = Field(None, description="Scheduled date")
     completedDate: Optional[datetime] = Field(None, description="Completion date")
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "id": "TASK001",
-                "name": "Pipeline Section A Visual Inspection",
-                "status": "completed",
-                "aiAutomationEnabled": True,
-                "aiConfidenceScore": 0.94,
-                "defectsDetected": 3,
-                "findings": "Minor corrosion detected at 3 locations",
-                "recommendations": [
-                    "Schedule maintenance within 6 months",
-                    "Monitor corrosion progression"
+    model_config = ConfigDict(json_schema_extra={"example": _EXAMPLE_INSPECTION_TASK})
+
+
+# Nested model fields walked by fast_build, keyed by parent model
+NESTED_MODELS: Dict[type, Dict[str, type]] = {
+    AnalysisResponse: {"result": AnalysisResult},
+    AnalysisResult: {"defects_detected": DetectedDefect},
+    DetectedDefect: {"location": DefectLocation, "dimensions": DefectDimensions},
+}
+
+
+def fast_build(cls, data: Dict):
+    """
+    Build a model from trusted internal data without validation
+
+    Nested dicts (and lists of dicts) are constructed bottom-up via
+    model_construct; values that are already model instances pass through.
+    Only use on data produced by this service, never on request payloads.
+    """
+    nested = NESTED_MODELS.get(cls)
+    if nested:
+        data = dict(data)
+        for name, child_cls in nested.items():
+            value = data.get(name)
+            if isinstance(value, dict):
+                data[name] = fast_build(child_cls, value)
+            elif isinstance(value, list):
+                data[name] = [
+                    fast_build(child_cls, item) if isinstance(item, dict) else item
+                    for item in value
                 ]
-            }
-        }
+    return cls.model_construct(**data)
@@ -2,12 +2,16 @@
 Oil field and installation models for Norwegian Continental Shelf
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, List
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import partial
 from enum import Enum
 
 
+_UTCNOW = partial(datetime.now, timezone.utc)
+
+
 class PlatformType(str, Enum):
     """Types of offshore platforms"""
     CONDEEP = "condeep"  # Concrete gravity-based
@@ -46,6 +50,18 @@ class SeaArea(str, Enum):
     BARENTS_SEA = "barents_sea"
 
 
+_EXAMPLE_OIL_FIELD_LOCATION = {
+    "latitude": 56.5466,
+    "longitude": 3.2183,
+    "blocks": ["2/4"],
+    "water_depth_min": 70,
+    "water_depth_max": 80,
+    "distance_from_shore_km": 320,
+    "nearest_city": "Stavanger",
+    "sea_area": "north_sea"
+}
+
+
 class OilFieldLocation(BaseModel):
     """Geographic location of an oil/gas field"""
     latitude: float = Field(..., ge=-90, le=90, description="Latitude in decimal degrees")
@@ -57,19 +73,16 @@ class OilFieldLocation(BaseModel):
     nearest_city: Optional[str] = None
     sea_area: SeaArea
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "latitude": 56.5466,
-                "longitude": 3.2183,
-                "blocks": ["2/4"],
-                "water_depth_min": 70,
-                "water_depth_max": 80,
-                "distance_from_shore_km": 320,
-                "nearest_city": "Stavanger",
-                "sea_area": "north_sea"
-            }
-        }
+    model_config = ConfigDict(json_schema_extra={"example": _EXAMPLE_OIL_FIELD_LOCATION})
+
+
+_EXAMPLE_PLATFORM = {
+    "name": "Statfjord A",
+    "platform_type": "condeep",
+    "installation_year": 1979,
+    "operational": True,
+    "unmanned": False
+}
 
 
 class Platform(BaseModel):
@@ -81,16 +94,40 @@ class Platform(BaseModel):
     unmanned: bool = False
     description: Optional[str] = None
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "name": "Statfjord A",
-                "platform_type": "condeep",
-                "installation_year": 1979,
-                "operational": True,
-                "unmanned": False
-            }
+    model_config = ConfigDict(
+        frozen=True,
+        extra="forbid",
+        json_schema_extra={"example": _EXAMPLE_PLATFORM}
+    )
+
+
+_EXAMPLE_OIL_FIELD = {
+    "field_id": "EKOFISK",
+    "name": "Ekofisk",
+    "operator": "ConocoPhillips Skandinavia AS",
+    "status": "producing",
+    "discovery_year": 1969,
+    "production_start_year": 1971,
+    "location": {
+        "latitude": 56.5466,
+        "longitude": 3.2183,
+        "blocks": ["2/4"],
+        "water_depth_min": 70,
+        "water_depth_max": 80,
+        "sea_area": "north_sea"
+    },
+    "resource_type": "oil_and_gas",
+    "platforms": [
+        {
+            "name": "Ekofisk Complex",
+            "platform_type": "condeep",
+            "installation_year": 1973,
+            "operational": True
         }
+    ],
+    "description": "First giant field discovered on NCS, hub for southern North Sea",
+    "satellite_fields": ["ELDFISK", "EMBLA", "TOR"]
+}
 
 
 class OilField(BaseModel):
@@ -115,39 +152,23 @@ class OilField(BaseModel):
     satellite_fields: List[str] = Field(default_factory=list, description="Connected satellite field IDs")
 
     # Metadata
-    last_updated: datetime = Field(default_factory=datetime.utcnow)
+    last_updated: datetime = Field(default_factory=_UTCNOW)
     data_source: str = "Norwegian Petroleum Directorate"
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "field_id": "EKOFISK",
-                "name": "Ekofisk",
-                "operator": "ConocoPhillips Skandinavia AS",
-                "status": "producing",
-                "discovery_year": 1969,
-                "production_start_year": 1971,
-                "location": {
-                    "latitude": 56.5466,
-                    "longitude": 3.2183,
-                    "blocks": ["2/4"],
-                    "water_depth_min": 70,
-                    "water_depth_max": 80,
-                    "sea_area": "north_sea"
-                },
-                "resource_type": "oil_and_gas",
-                "platforms": [
-                    {
-                        "name": "Ekofisk Complex",
-                        "platform_type": "condeep",
-                        "installation_year": 1973,
-                        "operational": True
-                    }
-                ],
-                "description": "First giant field discovered on NCS, hub for southern North Sea",
-                "satellite_fields": ["ELDFISK", "EMBLA", "TOR"]
-            }
-        }
+    model_config = ConfigDict(json_schema_extra={"example": _EXAMPLE_OIL_FIELD})
+
+
+_EXAMPLE_OIL_FIELD_SUMMARY = {
+    "field_id": "EKOFISK",
+    "name": "Ekofisk",
+    "operator": "ConocoPhillips Skandinavia AS",
+    "status": "producing",
+    "latitude": 56.5466,
+    "longitude": 3.2183,
+    "sea_area": "north_sea",
+    "resource_type": "oil_and_gas",
+    "production_start_year": 1971
+}
 
 
 class OilFieldSummary(BaseModel):
@@ -162,20 +183,24 @@ class OilFieldSummary(BaseModel):
     resource_type: ResourceType
     production_start_year: Optional[int] = None
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "field_id": "EKOFISK",
-                "name": "Ekofisk",
-                "operator": "ConocoPhillips Skandinavia AS",
-                "status": "producing",
-                "latitude": 56.5466,
-                "longitude": 3.2183,
-                "sea_area": "north_sea",
-                "resource_type": "oil_and_gas",
-                "production_start_year": 1971
-            }
-        }
+    model_config = ConfigDict(
+        frozen=True,
+        extra="forbid",
+        json_schema_extra={"example": _EXAMPLE_OIL_FIELD_SUMMARY}
+    )
+
+
+_EXAMPLE_CABLE_ROUTE = {
+    "route_id": "ROUTE_EKOFISK_EMDEN",
+    "name": "Ekofisk-Emden Cable",
+    "start_field_id": "EKOFISK",
+    "end_field_id": "ONSHORE_EMDEN",
+    "cable_type": "power",
+    "length_km": 440,
+    "installation_year": 2005,
+    "operational": True,
+    "inspection_required": True
+}
 
 
 class CableRoute(BaseModel):
@@ -192,20 +217,17 @@ class CableRoute(BaseModel):
     last_inspection_date: Optional[datetime] = None
     notes: Optional[str] = None
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "route_id": "ROUTE_EKOFISK_EMDEN",
-                "name": "Ekofisk-Emden Cable",
-                "start_field_id": "EKOFISK",
-                "end_field_id": "ONSHORE_EMDEN",
-                "cable_type": "power",
-                "length_km": 440,
-                "installation_year": 2005,
-                "operational": True,
-                "inspection_required": True
-            }
-        }
+    model_config = ConfigDict(json_schema_extra={"example": _EXAMPLE_CABLE_ROUTE})
+
+
+_EXAMPLE_INFRASTRUCTURE_CLUSTER = {
+    "cluster_id": "EKOFISK_AREA",
+    "name": "Greater Ekofisk Area",
+    "hub_field_id": "EKOFISK",
+    "connected_field_ids": ["ELDFISK", "EMBLA", "TOR", "HOD", "TOMMELITEN_A"],
+    "sea_area": "north_sea",
+    "description": "Southern North Sea hub complex"
+}
 
 
 class InfrastructureCluster(BaseModel):
@@ -217,14 +239,4 @@ class InfrastructureCluster(BaseModel):
     sea_area: SeaArea
     description: Optional[str] = None
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "cluster_id": "EKOFISK_AREA",
-                "name": "Greater Ekofisk Area",
-                "hub_field_id": "EKOFISK",
-                "connected_field_ids": ["ELDFISK", "EMBLA", "TOR", "HOD", "TOMMELITEN_A"],
-                "sea_area": "north_sea",
-                "description": "Southern North Sea hub complex"
-            }
-        }
+    model_config = ConfigDict(json_schema_extra={"example": _EXAMPLE_INFRASTRUCTURE_CLUSTER})
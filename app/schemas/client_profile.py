@@ -2,8 +2,8 @@
 Pydantic schemas for Client Profile
 """
 
-from pydantic import BaseModel, Field, EmailStr
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field, EmailStr, TypeAdapter
+from typing import Any, Optional
 from datetime import datetime
 
 
@@ -30,6 +30,19 @@ class ClientProfileUpdate(BaseModel):
     phone: Optional[str] = Field(None, max_length=50)
 
 
+_EXAMPLE_CLIENT_PROFILE_RESPONSE = {
+    "id": 1,
+    "profile_key": "default_profile",
+    "name": "Kjell R. Christensen",
+    "company": "DOF",
+    "role": "Analyst",
+    "email": "kjell@dof.no",
+    "phone": "+47 123 45 678",
+    "created_at": "2025-10-15T12:00:00Z",
+    "updated_at": "2025-10-15T12:00:00Z"
+}
+
+
 class ClientProfileResponse(ClientProfileBase):
     """Schema for client profile response"""
     id: int
@@ -37,18 +50,16 @@ class ClientProfileResponse(ClientProfileBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
-        json_schema_extra = {
-            "example": {
-                "id": 1,
-                "profile_key": "default_profile",
-                "name": "Kjell R. Christensen",
-                "company": "DOF",
-                "role": "Analyst",
-                "email": "kjell@dof.no",
-                "phone": "+47 123 45 678",
-                "created_at": "2025-10-15T12:00:00Z",
-                "updated_at": "2025-10-15T12:00:00Z"
-            }
-        }
+    model_config = ConfigDict(
+        from_attributes=True,
+        json_schema_extra={"example": _EXAMPLE_CLIENT_PROFILE_RESPONSE}
+    )
+
+
+# Built once so the validator is reused across requests
+CLIENT_PROFILE_ADAPTER = TypeAdapter(ClientProfileResponse)
+
+
+def validate_client_profile(data: Any) -> ClientProfileResponse:
+    """Validate a dict or ORM ClientProfile into a ClientProfileResponse"""
+    return CLIENT_PROFILE_ADAPTER.validate_python(data)
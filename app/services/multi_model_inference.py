@@ -9,20 +9,38 @@ Integrates three specialized YOLO models:
 Allows analyzing images with multiple models for more accurate and comprehensive detection.
 """
 
+import asyncio
+import gc
+import itertools
+import os
+import sys
 import uuid
-from typing import List, Dict, Optional, Any
-from datetime import datetime
+from collections import OrderedDict
+from functools import cache
+from typing import List, Dict, Optional, Any, Union
+from datetime import datetime, timezone
 from PIL import Image
 import numpy as np
 from enum import Enum
 
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 from app.models.inspection import (
     DetectedDefect,
     DefectType,
     DefectSeverity,
     DefectLocation,
     DefectDimensions,
-    AssetCondition
+    AssetCondition,
+    DefectTypeCode,
+    DefectSeverityCode,
+    DEFECT_TYPE_FROM_CODE,
+    DEFECT_SEVERITY_FROM_CODE,
+    defect_type_codes
 )
 
 
@@ -33,6 +51,20 @@ class ModelType(str, Enum):
     MAS_YOLOV11 = "mas_yolov11"             # MAS-YOLOv11 for general detection
 
 
+# Square input size the models are exported and warmed up at
+INPUT_SIZE = 640
+
+# How many models may stay loaded at once; the least recently used is unloaded beyond this
+MAX_RESIDENT_MODELS = int(os.getenv("MAX_RESIDENT_MODELS", str(len(ModelType))))
+
+# Integer codes (declaration order) for the DetectionBatch model_id column
+_MODEL_TYPE_TO_CODE = {m: i for i, m in enumerate(ModelType)}
+MODEL_TYPE_FROM_CODE = tuple(ModelType)
+
+# Defect types that escalate to CRITICAL at very high confidence
+_CRITICAL_TYPE_CODES = defect_type_codes([DefectType.CRACK, DefectType.DAMAGE])
+
+
 class ModelStatus(str, Enum):
     """Model loading status"""
     NOT_LOADED = "not_loaded"
@@ -55,6 +87,14 @@ class ModelInfo:
         self.specialization = self._get_specialization()
         self.confidence_threshold = 0.25
         self.iou_threshold = 0.45
+        self.max_detections = 300
+
+        # Inference placement, set on load: FP16 on GPU, FP32 on CPU
+        self.device: Union[int, str] = "cpu"
+        self.dtype = "float32"
+
+        # DefectType code per class id, built from the model's class names
+        self.class_id_to_defect: Optional[np.ndarray] = None
 
     def _get_specialization(self) -> str:
         """Get model specialization description"""
@@ -87,29 +127,212 @@ class ModelDetection:
         self.severity = severity
 
 
+class DetectionBatch:
+    """
+    Detections from one or more models, stored column-wise
+
+    Each field is a numpy array with one row per detection, so grouping and
+    consensus work on whole columns; ModelDetection objects are only built
+    at the API boundary via to_detections().
+    """
+    def __init__(
+        self,
+        xywh: np.ndarray,
+        conf: np.ndarray,
+        cls_id: np.ndarray,
+        model_id: np.ndarray,
+        defect_code: np.ndarray,
+        severity_code: np.ndarray,
+        class_names: List[str]
+    ):
+        self.xywh = xywh                    # (N, 4) int32 [x, y, width, height]
+        self.conf = conf                    # (N,) float32
+        self.cls_id = cls_id                # (N,) int32 model class index
+        self.model_id = model_id            # (N,) int8 ModelType code
+        self.defect_code = defect_code      # (N,) uint8 DefectType code
+        self.severity_code = severity_code  # (N,) uint8 DefectSeverity code
+        self.class_names = class_names
+
+    @classmethod
+    def empty(cls) -> "DetectionBatch":
+        return cls(
+            xywh=np.empty((0, 4), dtype=np.int32),
+            conf=np.empty(0, dtype=np.float32),
+            cls_id=np.empty(0, dtype=np.int32),
+            model_id=np.empty(0, dtype=np.int8),
+            defect_code=np.empty(0, dtype=np.uint8),
+            severity_code=np.empty(0, dtype=np.uint8),
+            class_names=[]
+        )
+
+    @classmethod
+    def concatenate(cls, batches: List["DetectionBatch"]) -> "DetectionBatch":
+        """Stack batches row-wise, preserving order"""
+        if not batches:
+            return cls.empty()
+        if len(batches) == 1:
+            return batches[0]
+        return cls(
+            xywh=np.concatenate([b.xywh for b in batches]),
+            conf=np.concatenate([b.conf for b in batches]),
+            cls_id=np.concatenate([b.cls_id for b in batches]),
+            model_id=np.concatenate([b.model_id for b in batches]),
+            defect_code=np.concatenate([b.defect_code for b in batches]),
+            severity_code=np.concatenate([b.severity_code for b in batches]),
+            class_names=[name for b in batches for name in b.class_names]
+        )
+
+    def __len__(self) -> int:
+        return len(self.conf)
+
+    def to_detections(self) -> List[ModelDetection]:
+        """Materialize one ModelDetection per row"""
+        return [
+            ModelDetection(
+                model_type=MODEL_TYPE_FROM_CODE[model_id],
+                bbox=bbox,
+                confidence=confidence,
+                class_id=class_id,
+                class_name=class_name,
+                defect_type=DEFECT_TYPE_FROM_CODE[defect_code],
+                severity=DEFECT_SEVERITY_FROM_CODE[severity_code]
+            )
+            for bbox, confidence, class_id, model_id, defect_code, severity_code, class_name in zip(
+                self.xywh.tolist(),
+                self.conf.tolist(),
+                self.cls_id.tolist(),
+                self.model_id.tolist(),
+                self.defect_code.tolist(),
+                self.severity_code.tolist(),
+                self.class_names
+            )
+        ]
+
+
 class MultiModelResult:
     """Aggregated result from multiple models"""
     def __init__(self):
-        self.detections_by_model: Dict[ModelType, List[ModelDetection]] = {}
+        self.detections_by_model: Dict[ModelType, DetectionBatch] = {}
+        self.detection_counts: Dict[ModelType, int] = {}
         self.consensus_detections: List[DetectedDefect] = []
         self.model_confidences: Dict[ModelType, float] = {}
         self.overall_confidence: float = 0.0
         self.analysis_metadata: Dict[str, Any] = {}
 
 
+def _pairwise_iou(bboxes: np.ndarray, scratch: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Intersection over Union between every pair of [x, y, width, height] boxes
+
+    Returns an (N, N) matrix; pairs with an empty union score 0.
+
+    Args:
+        bboxes: (N, 4) float64 boxes
+        scratch: Optional (3, M, M) float64 work buffer with M >= N; when
+            given, all intermediates are written into it and the result is
+            a view of it, valid until the buffer is next reused
+    """
+    n = len(bboxes)
+    if scratch is None:
+        scratch = np.empty((3, n, n))
+    intersection, inter_h, union = scratch[0, :n, :n], scratch[1, :n, :n], scratch[2, :n, :n]
+
+    x1, y1 = bboxes[:, 0], bboxes[:, 1]
+    x2, y2 = x1 + bboxes[:, 2], y1 + bboxes[:, 3]
+
+    # Intersection width (into intersection) and height (into inter_h)
+    np.minimum(x2[:, None], x2[None, :], out=intersection)
+    np.subtract(intersection, np.maximum(x1[:, None], x1[None, :], out=union), out=intersection)
+    np.clip(intersection, 0, None, out=intersection)
+    np.minimum(y2[:, None], y2[None, :], out=inter_h)
+    np.subtract(inter_h, np.maximum(y1[:, None], y1[None, :], out=union), out=inter_h)
+    np.clip(inter_h, 0, None, out=inter_h)
+    np.multiply(intersection, inter_h, out=intersection)
+
+    area = bboxes[:, 2] * bboxes[:, 3]
+    np.add(area[:, None], area[None, :], out=union)
+    np.subtract(union, intersection, out=union)
+
+    iou = inter_h
+    iou.fill(0)
+    return np.divide(intersection, union, out=iou, where=union > 0)
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, nogil=True)
+    def _group_boxes_nb(bboxes, iou_threshold):
+        """
+        Greedy overlap grouping (Numba JIT); returns a group id per box
+
+        Same semantics and IoU arithmetic as _group_overlapping_detections,
+        without materializing the (N, N) IoU matrix. Runs without the GIL,
+        so model threads of concurrent requests keep going meanwhile.
+        """
+        n = bboxes.shape[0]
+        group_ids = np.full(n, -1, dtype=np.int64)
+        next_group = 0
+        for i in range(n):
+            if group_ids[i] != -1:
+                continue
+            group_ids[i] = next_group
+            x1_1 = bboxes[i, 0]
+            y1_1 = bboxes[i, 1]
+            x2_1 = x1_1 + bboxes[i, 2]
+            y2_1 = y1_1 + bboxes[i, 3]
+            area1 = bboxes[i, 2] * bboxes[i, 3]
+            for j in range(i + 1, n):
+                if group_ids[j] != -1:
+                    continue
+                x1_i = max(x1_1, bboxes[j, 0])
+                y1_i = max(y1_1, bboxes[j, 1])
+                x2_i = min(x2_1, bboxes[j, 0] + bboxes[j, 2])
+                y2_i = min(y2_1, bboxes[j, 1] + bboxes[j, 3])
+                if x2_i < x1_i or y2_i < y1_i:
+                    continue
+                intersection = (x2_i - x1_i) * (y2_i - y1_i)
+                union = area1 + bboxes[j, 2] * bboxes[j, 3] - intersection
+                iou = intersection / union if union > 0 else 0.0
+                if iou >= iou_threshold:
+                    group_ids[j] = next_group
+            next_group += 1
+        return group_ids
+
+
 class MultiModelInferenceService:
     """
     Service for running multiple YOLO models on the same image
     and aggregating results for improved accuracy
     """
 
-    def __init__(self):
+    def __init__(self, max_resident_models: int = MAX_RESIDENT_MODELS):
         self.models: Dict[ModelType, ModelInfo] = {}
         self.enabled_models: List[ModelType] = []
 
+        # Loaded models, least recently used first
+        self.max_resident_models = max_resident_models
+        self._resident: "OrderedDict[ModelType, None]" = OrderedDict()
+
+        # Consensus defect ids: random per-process prefix + counter (cheaper than uuid4 per defect)
+        self._defect_id_prefix = uuid.uuid4().hex[:4]
+        self._defect_ids = itertools.count()
+
+        # Reusable (3, M, M) work buffer for the NumPy IoU matrix
+        self._iou_scratch: Optional[np.ndarray] = None
+
+        # Reusable page-locked staging buffer for GPU input uploads
+        self._pinned = None
+        self._pinned_event = None
+
+        # Class name -> DefectType, filled from each model's class names on load
+        self._class_map: Dict[str, DefectType] = {}
+
         # Initialize model registry
         self._initialize_model_registry()
 
+        # Compile (or load from cache) the grouping kernel before the first request
+        if NUMBA_AVAILABLE:
+            _group_boxes_nb(np.zeros((1, 4), dtype=np.float64), 0.5)
+
     def _initialize_model_registry(self):
         """Initialize available models (not loading them yet)"""
         # YOLOv8 Crack Detection Model
@@ -152,18 +375,51 @@ class MultiModelInferenceService:
             if model_path:
                 model_info.model_path = model_path
 
-            # Load YOLO model using ultralytics
-            from ultralytics import YOLO
+            import torch
+
+            # Half precision doubles tensor-core throughput; CPUs stay in FP32
+            if torch.cuda.is_available():
+                model_info.device = 0
+                model_info.dtype = "float16"
+                # Autotune conv kernels once per input shape
+                torch.backends.cudnn.benchmark = True
+            else:
+                model_info.device = "cpu"
+                model_info.dtype = "float32"
+
+            # Load YOLO model using ultralytics (a first-time engine export can take minutes)
+            model_info.model = await asyncio.to_thread(self._load_yolo, model_info)
+
+            # Resolve the model's class names to defect types once, up front
+            self._build_class_table(model_info, model_info.model.names)
+
+            # Warm up so kernel selection and autotuning don't land on the first request
+            await asyncio.to_thread(
+                model_info.model.predict,
+                np.zeros((INPUT_SIZE, INPUT_SIZE, 3), dtype=np.uint8),
+                imgsz=INPUT_SIZE,
+                half=model_info.dtype == "float16",
+                device=model_info.device,
+                verbose=False
+            )
 
-            model_info.model = YOLO(model_info.model_path)
             model_info.status = ModelStatus.READY
-            model_info.loaded_at = datetime.utcnow()
+            model_info.loaded_at = datetime.now(timezone.utc)
 
             # Add to enabled models
             if model_type not in self.enabled_models:
                 self.enabled_models.append(model_type)
 
             print(f"✅ Loaded {model_type.value}: {model_info.specialization}")
+
+            # Evict least recently used models beyond the residency cap
+            self._resident[model_type] = None
+            self._resident.move_to_end(model_type)
+            while len(self._resident) > max(self.max_resident_models, 1):
+                evicted = next(iter(self._resident))
+                print(f"♻️  Unloading {evicted.value} (least recently used)")
+                await self.unload_model(evicted)
+
             return True
 
         except Exception as e:
@@ -172,6 +428,49 @@ class MultiModelInferenceService:
             print(f"❌ Failed to load {model_type.value}: {str(e)}")
             return False
 
+    def _load_yolo(self, model_info: ModelInfo):
+        """
+        Load a model's weights, preferring a TensorRT engine on CUDA hosts
+
+        The FP16 engine is exported next to the .pt weights (as *_trt.engine)
+        on first load and reused afterwards. Without CUDA, or if the export
+        fails (e.g. TensorRT not installed), the PyTorch weights are used.
+        """
+        from ultralytics import YOLO
+
+        if model_info.model_path.endswith(".engine"):
+            return YOLO(model_info.model_path, task="detect")
+
+        if model_info.device != "cpu":
+            engine_path = os.path.splitext(model_info.model_path)[0] + "_trt.engine"
+            try:
+                if not os.path.exists(engine_path):
+                    exported = YOLO(model_info.model_path).export(
+                        format="engine",
+                        half=True,
+                        imgsz=INPUT_SIZE,
+                        workspace=4,
+                        device=model_info.device
+                    )
+                    os.replace(exported, engine_path)
+                return YOLO(engine_path, task="detect")
+            except Exception as e:
+                print(f"⚠️  TensorRT engine unavailable for {model_info.model_type.value}, using PyTorch weights: {str(e)}")
+
+        import torch
+
+        model = YOLO(model_info.model_path)
+
+        # Fold Conv+BatchNorm once at load instead of on the first predict
+        model.fuse()
+
+        # Inference only: freeze the weights so no autograd state is ever kept
+        if isinstance(model.model, torch.nn.Module):
+            model.model.eval()
+            for param in model.model.parameters():
+                param.requires_grad_(False)
+        return model
+
     async def load_all_models(self) -> Dict[ModelType, bool]:
         """
         Load all available models
@@ -189,12 +488,28 @@ class MultiModelInferenceService:
         if model_type in self.models:
             model_info = self.models[model_type]
             model_info.model = None
+            model_info.class_id_to_defect = None
             model_info.status = ModelStatus.NOT_LOADED
             model_info.loaded_at = None
 
             if model_type in self.enabled_models:
                 self.enabled_models.remove(model_type)
 
+            self._resident.pop(model_type, None)
+            self._release_memory()
+
+    def _release_memory(self):
+        """Collect dropped models and hand cached CUDA blocks back to the driver"""
+        gc.collect()
+
+        # Only touch CUDA if torch was already imported by a model load
+        torch = sys.modules.get("torch")
+        if torch is not None and torch.cuda.is_available():
+            torch.cuda.empty_cache()
+            torch.cuda.ipc_collect()
+            free, total = torch.cuda.mem_get_info()
+            print(f"🧹 GPU memory free: {free / 2**20:.0f} / {total / 2**20:.0f} MiB")
+
     def get_model_status(self) -> Dict[str, Any]:
         """Get status of all models"""
         status = {}
@@ -205,13 +520,15 @@ class MultiModelInferenceService:
                 "loaded_at": model_info.loaded_at.isoformat() if model_info.loaded_at else None,
                 "error": model_info.error_message,
                 "confidence_threshold": model_info.confidence_threshold,
-                "iou_threshold": model_info.iou_threshold
+                "iou_threshold": model_info.iou_threshold,
+                "max_detections": model_info.max_detections,
+                "dtype": model_info.dtype
             }
         return status
 
     async def analyze_with_multiple_models(
         self,
-        image: Image.Image,
+        image: Union[Image.Image, np.ndarray],
         models: Optional[List[ModelType]] = None,
         aggregate: bool = True
     ) -> MultiModelResult:
@@ -219,7 +536,7 @@ class MultiModelInferenceService:
         Analyze image with multiple models
 
         Args:
-            image: PIL Image to analyze
+            image: PIL Image or HxWxC numpy array to analyze
             models: List of models to use (None = all enabled models)
             aggregate: Whether to aggregate results into consensus detections
 
@@ -234,7 +551,7 @@ class MultiModelInferenceService:
         if not models_to_use:
             raise ValueError("No models enabled. Load models first.")
 
-        # Run inference on each model
+        ready_models = []
         for model_type in models_to_use:
             if model_type not in self.enabled_models:
                 print(f"⚠️  Skipping {model_type.value} - not loaded")
@@ -246,96 +563,167 @@ class MultiModelInferenceService:
                 print(f"⚠️  Skipping {model_type.value} - not ready")
                 continue
 
-            # Run model inference
-            detections = await self._run_model_inference(image, model_info)
+            ready_models.append(model_info)
+            if model_type in self._resident:
+                self._resident.move_to_end(model_type)
+
+        # Convert to one contiguous array shared by all models (no copy for ndarray input)
+        img_array = np.ascontiguousarray(np.asarray(image))
+
+        # On a shared GPU, preprocess and upload the image once for every model
+        device_input = None
+        devices = {model_info.device for model_info in ready_models}
+        if len(devices) == 1 and "cpu" not in devices and img_array.ndim == 3 and img_array.shape[2] == 3:
+            device_input = self._prepare_device_input(
+                img_array,
+                devices.pop(),
+                half=all(model_info.dtype == "float16" for model_info in ready_models)
+            )
+
+        # Run each model (predict + post-processing) on its own worker thread
+        all_detections = await asyncio.gather(*(
+            asyncio.to_thread(self._run_model_inference_sync, img_array, model_info, device_input)
+            for model_info in ready_models
+        ))
+
+        for model_info, detections in zip(ready_models, all_detections):
+            model_type = model_info.model_type
             result.detections_by_model[model_type] = detections
+            result.detection_counts[model_type] = len(detections)
 
             # Calculate model confidence
-            if detections:
-                avg_confidence = sum(d.confidence for d in detections) / len(detections)
+            if result.detection_counts[model_type]:
+                avg_confidence = float(detections.conf.mean(dtype=np.float64))
                 result.model_confidences[model_type] = round(avg_confidence, 3)
             else:
                 result.model_confidences[model_type] = 0.0
 
+        total_detections = sum(result.detection_counts.values())
+
         # Aggregate results if requested
         if aggregate:
-            result.consensus_detections = self._aggregate_detections(result)
+            # Nothing to group on the common "no defects" path
+            if total_detections:
+                result.consensus_detections = self._aggregate_detections(result)
             result.overall_confidence = self._calculate_overall_confidence(result)
 
         # Add metadata
         result.analysis_metadata = {
             "models_used": [m.value for m in models_to_use],
-            "total_detections": sum(len(dets) for dets in result.detections_by_model.values()),
+            "total_detections": total_detections,
             "consensus_detections": len(result.consensus_detections),
-            "analyzed_at": datetime.utcnow().isoformat()
+            "analyzed_at": datetime.now(timezone.utc).isoformat()
         }
 
         return result
 
-    async def _run_model_inference(
+    def _prepare_device_input(self, img_array: np.ndarray, device: Union[int, str], half: bool):
+        """
+        Letterbox an image once and upload it as a model-ready tensor
+
+        Applies the same letterbox, channel order and scaling predict() uses
+        for numpy input, then copies through a reusable pinned host buffer so
+        the host-to-device transfer is asynchronous.
+
+        Returns:
+            (1, 3, INPUT_SIZE, INPUT_SIZE) tensor on the device
+        """
+        import torch
+        from ultralytics.data.augment import LetterBox
+
+        boxed = LetterBox(new_shape=(INPUT_SIZE, INPUT_SIZE), auto=False)(image=img_array)
+        chw = np.ascontiguousarray(boxed[..., ::-1].transpose(2, 0, 1))
+
+        dtype = torch.float16 if half else torch.float32
+        if self._pinned is None or self._pinned.dtype != dtype:
+            self._pinned = torch.empty((1, 3, INPUT_SIZE, INPUT_SIZE), dtype=dtype, pin_memory=True)
+            self._pinned_event = None
+        elif self._pinned_event is not None:
+            # The previous upload must finish reading the buffer before it is refilled
+            self._pinned_event.synchronize()
+
+        self._pinned[0].copy_(torch.from_numpy(chw))
+        self._pinned.div_(255)
+
+        device_input = self._pinned.to(f"cuda:{device}" if isinstance(device, int) else device, non_blocking=True)
+        self._pinned_event = torch.cuda.Event()
+        self._pinned_event.record()
+        return device_input
+
+    def _run_model_inference_sync(
         self,
-        image: Image.Image,
-        model_info: ModelInfo
-    ) -> List[ModelDetection]:
+        img_array: np.ndarray,
+        model_info: ModelInfo,
+        device_input=None
+    ) -> DetectionBatch:
         """
-        Run inference on a single model
+        Run inference on a single model (blocking; called from a worker thread)
 
         Args:
-            image: PIL Image
+            img_array: Image as a numpy array
             model_info: Model information
+            device_input: Optional preprocessed device tensor from
+                _prepare_device_input, used instead of img_array
 
         Returns:
-            List of detections from this model
+            Batch of detections from this model
         """
-        detections = []
+        import torch
 
-        try:
-            # Convert PIL to numpy array
-            img_array = np.array(image)
+        batches = []
 
-            # Run YOLO inference
-            results = model_info.model.predict(
-                img_array,
-                conf=model_info.confidence_threshold,
-                iou=model_info.iou_threshold,
-                verbose=False
-            )
+        try:
+            # Run YOLO inference without autograd tracking
+            with torch.inference_mode():
+                results = model_info.model.predict(
+                    img_array if device_input is None else device_input,
+                    conf=model_info.confidence_threshold,
+                    iou=model_info.iou_threshold,
+                    max_det=model_info.max_detections,
+                    half=model_info.dtype == "float16",
+                    device=model_info.device,
+                    verbose=False
+                )
 
             # Process results
             for result in results:
                 boxes = result.boxes
 
-                for i, box in enumerate(boxes):
-                    # Extract bbox coordinates
-                    x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                    width = int(x2 - x1)
-                    height = int(y2 - y1)
-                    bbox = [int(x1), int(y1), width, height]
-
-                    # Extract confidence and class
-                    confidence = float(box.conf[0])
-                    class_id = int(box.cls[0])
-                    class_name = result.names[class_id]
-
-                    # Map to defect type and severity
-                    defect_type = self._map_class_to_defect_type(class_name, model_info.model_type)
-                    severity = self._calculate_severity(confidence, bbox, defect_type)
-
-                    detection = ModelDetection(
-                        model_type=model_info.model_type,
-                        bbox=bbox,
-                        confidence=confidence,
-                        class_id=class_id,
-                        class_name=class_name,
-                        defect_type=defect_type,
-                        severity=severity
-                    )
-                    detections.append(detection)
+                # Pull all boxes to host memory in one transfer per tensor
+                xyxy = boxes.xyxy.cpu().numpy()
+                confs = boxes.conf.cpu().numpy()
+
+                # Boxes from a preprocessed tensor are in letterbox space
+                if device_input is not None:
+                    from ultralytics.utils.ops import scale_boxes
+                    xyxy = scale_boxes((INPUT_SIZE, INPUT_SIZE), xyxy.copy(), img_array.shape[:2])
+
+                cls_ids = boxes.cls.cpu().numpy().astype(np.int32)
+
+                # [x, y, width, height], truncated like int() per coordinate
+                xywh = np.hstack((xyxy[:, 0:2], xyxy[:, 2:4] - xyxy[:, 0:2])).astype(np.int32)
+
+                # Map to defect type and severity
+                class_names = [result.names[class_id] for class_id in cls_ids.tolist()]
+                class_table = model_info.class_id_to_defect
+                if class_table is None:
+                    class_table = self._build_class_table(model_info, result.names)
+                defect_codes = class_table[cls_ids]
+
+                batches.append(DetectionBatch(
+                    xywh=xywh,
+                    conf=confs.astype(np.float32, copy=False),
+                    cls_id=cls_ids,
+                    model_id=np.full(len(cls_ids), _MODEL_TYPE_TO_CODE[model_info.model_type], dtype=np.int8),
+                    defect_code=defect_codes,
+                    severity_code=self._calculate_severity(confs, xywh, defect_codes),
+                    class_names=class_names
+                ))
 
         except Exception as e:
             print(f"❌ Error during {model_info.model_type.value} inference: {str(e)}")
 
-        return detections
+        return DetectionBatch.concatenate(batches)
 
     def _aggregate_detections(self, result: MultiModelResult) -> List[DetectedDefect]:
         """
@@ -346,126 +734,112 @@ class MultiModelInferenceService:
         2. Weight by model confidence
         3. Prioritize detections confirmed by multiple models
         """
-        all_detections = []
-
-        # Collect all detections
-        for model_type, detections in result.detections_by_model.items():
-            all_detections.extend(detections)
+        batches = [dets for dets in result.detections_by_model.values() if len(dets)]
 
-        if not all_detections:
+        if not batches:
             return []
 
-        # Group overlapping detections
-        consensus_groups = self._group_overlapping_detections(all_detections)
+        # Collect all detections into one set of columns
+        detections = DetectionBatch.concatenate(batches)
 
-        # Convert to DetectedDefect objects
-        consensus_defects = []
-        for group in consensus_groups:
-            defect = self._create_consensus_defect(group)
-            consensus_defects.append(defect)
+        if len(result.detections_by_model) == 1:
+            # A single model cannot corroborate itself: each detection stands alone
+            groups = np.arange(len(detections))[:, None]
+        else:
+            # Group overlapping detections
+            group_ids = self._group_overlapping_detections(detections.xywh.astype(np.float64))
+
+            # Row indices of each group, in group order, ascending within a group
+            order = np.argsort(group_ids, kind="stable")
+            groups = np.split(order, np.flatnonzero(np.diff(group_ids[order])) + 1)
 
-        return consensus_defects
+        # Convert to DetectedDefect objects
+        return [self._create_consensus_defect(detections, group) for group in groups]
 
     def _group_overlapping_detections(
         self,
-        detections: List[ModelDetection],
+        bboxes: np.ndarray,
         iou_threshold: float = 0.5
-    ) -> List[List[ModelDetection]]:
+    ) -> np.ndarray:
         """
         Group detections that overlap (same defect detected by multiple models)
-        """
-        groups = []
-        used = set()
-
-        for i, det1 in enumerate(detections):
-            if i in used:
-                continue
 
-            group = [det1]
-            used.add(i)
+        Each ungrouped detection, in order, seeds a group with every later
+        ungrouped detection whose IoU with the seed meets the threshold.
 
-            for j, det2 in enumerate(detections[i+1:], start=i+1):
-                if j in used:
-                    continue
-
-                # Calculate IoU
-                iou = self._calculate_iou(det1.bbox, det2.bbox)
-
-                if iou >= iou_threshold:
-                    group.append(det2)
-                    used.add(j)
-
-            groups.append(group)
-
-        return groups
-
-    def _calculate_iou(self, bbox1: List[int], bbox2: List[int]) -> float:
-        """Calculate Intersection over Union between two bounding boxes"""
-        x1_1, y1_1, w1, h1 = bbox1
-        x2_1, y2_1 = x1_1 + w1, y1_1 + h1
-
-        x1_2, y1_2, w2, h2 = bbox2
-        x2_2, y2_2 = x1_2 + w2, y1_2 + h2
-
-        # Calculate intersection
-        x1_i = max(x1_1, x1_2)
-        y1_i = max(y1_1, y1_2)
-        x2_i = min(x2_1, x2_2)
-        y2_i = min(y2_1, y2_2)
-
-        if x2_i < x1_i or y2_i < y1_i:
-            return 0.0
+        Args:
+            bboxes: (N, 4) float64 array of [x, y, width, height] boxes
 
-        intersection = (x2_i - x1_i) * (y2_i - y1_i)
+        Returns:
+            Group id per detection, numbered in seed order
+        """
+        if NUMBA_AVAILABLE:
+            return _group_boxes_nb(bboxes, iou_threshold)
+
+        # All pairwise IoUs in one vectorized pass, in a buffer grown to the next power of two
+        n = len(bboxes)
+        if self._iou_scratch is None or self._iou_scratch.shape[1] < n:
+            size = 1 << (n - 1).bit_length()
+            self._iou_scratch = np.empty((3, size, size))
+        overlaps = _pairwise_iou(bboxes, self._iou_scratch) >= iou_threshold
+
+        group_ids = np.empty(len(bboxes), dtype=np.int64)
+        unassigned = np.ones(len(bboxes), dtype=bool)
+        next_group = 0
+
+        for i in range(len(bboxes)):
+            if not unassigned[i]:
+                continue
 
-        # Calculate union
-        area1 = w1 * h1
-        area2 = w2 * h2
-        union = area1 + area2 - intersection
+            # Every earlier box is already assigned, so the full row only adds later ones
+            members = overlaps[i] & unassigned
+            members[i] = True
+            group_ids[members] = next_group
+            unassigned[members] = False
+            next_group += 1
 
-        return intersection / union if union > 0 else 0.0
+        return group_ids
 
-    def _create_consensus_defect(self, group: List[ModelDetection]) -> DetectedDefect:
+    def _create_consensus_defect(self, detections: DetectionBatch, group: np.ndarray) -> DetectedDefect:
         """
         Create a consensus defect from a group of overlapping detections
+
+        Args:
+            detections: All detections being aggregated
+            group: Row indices of the overlapping detections
         """
         # Average bbox coordinates
-        avg_x = int(np.mean([d.bbox[0] for d in group]))
-        avg_y = int(np.mean([d.bbox[1] for d in group]))
-        avg_w = int(np.mean([d.bbox[2] for d in group]))
-        avg_h = int(np.mean([d.bbox[3] for d in group]))
+        avg_x, avg_y, avg_w, avg_h = detections.xywh[group].mean(axis=0).astype(int).tolist()
 
         # Weighted confidence (weight by number of models agreeing)
-        avg_confidence = np.mean([d.confidence for d in group])
+        avg_confidence = detections.conf[group].mean(dtype=np.float64)
         consensus_boost = min(len(group) * 0.05, 0.15)  # Boost up to 15% for multi-model agreement
         final_confidence = min(avg_confidence + consensus_boost, 1.0)
 
-        # Most common defect type
-        defect_types = [d.defect_type for d in group]
-        most_common_type = max(set(defect_types), key=defect_types.count)
+        # Most common defect type (ties go to the first-declared type)
+        most_common_type = DEFECT_TYPE_FROM_CODE[np.bincount(detections.defect_code[group]).argmax()]
 
-        # Highest severity
-        severities = [d.severity for d in group]
-        severity_order = [DefectSeverity.LOW, DefectSeverity.MEDIUM, DefectSeverity.HIGH, DefectSeverity.CRITICAL]
-        highest_severity = max(severities, key=lambda s: severity_order.index(s))
+        # Highest severity (codes follow LOW < MEDIUM < HIGH < CRITICAL)
+        highest_severity = DEFECT_SEVERITY_FROM_CODE[detections.severity_code[group].max()]
 
         # Build description
-        models_detected = [d.model_type.value for d in group]
+        models_detected = [MODEL_TYPE_FROM_CODE[m].value for m in detections.model_id[group].tolist()]
         description = f"{most_common_type.value.title()} detected by {len(group)} model(s): {', '.join(models_detected)}"
 
         # Estimate dimensions from bbox
-        dimensions = DefectDimensions(
+        dimensions = DefectDimensions.model_construct(
             length=float(avg_w) / 10,  # Rough conversion, needs calibration
             width=float(avg_h) / 10,
             depth=None  # Cannot estimate from 2D image
         )
 
-        return DetectedDefect(
-            id=f"defect_{uuid.uuid4().hex[:8]}",
+        # All fields are computed here, so skip validation
+        return DetectedDefect.model_construct(
+            id=f"defect_{self._defect_id_prefix}{next(self._defect_ids):08x}",
             type=most_common_type,
             severity=highest_severity,
-            confidence=round(final_confidence, 3),
-            location=DefectLocation(x=avg_x, y=avg_y, width=avg_w, height=avg_h),
+            confidence=round(float(final_confidence), 3),
+            location=DefectLocation.model_construct(x=avg_x, y=avg_y, width=avg_w, height=avg_h),
             description=description,
             dimensions=dimensions
         )
@@ -476,7 +850,7 @@ class MultiModelInferenceService:
             return 0.0
 
         # Weight by number of detections
-        total_detections = sum(len(dets) for dets in result.detections_by_model.values())
+        total_detections = sum(result.detection_counts.values())
 
         if total_detections == 0:
             return 0.95  # High confidence if no defects found by any model
@@ -484,11 +858,27 @@ class MultiModelInferenceService:
         # Average confidence weighted by detection count
         weighted_sum = 0.0
         for model_type, confidence in result.model_confidences.items():
-            detection_count = len(result.detections_by_model.get(model_type, []))
+            detection_count = result.detection_counts.get(model_type, 0)
             weighted_sum += confidence * detection_count
 
         return round(weighted_sum / total_detections, 3)
 
+    def _build_class_table(self, model_info: ModelInfo, names: Dict[int, str]) -> np.ndarray:
+        """Build and store the model's class id -> DefectType code lookup array"""
+        table = np.full(max(names, default=-1) + 1, DefectTypeCode.UNKNOWN, dtype=np.uint8)
+        for class_id, class_name in names.items():
+            table[class_id] = DefectTypeCode[self._lookup_defect_type(class_name, model_info.model_type).name]
+        model_info.class_id_to_defect = table
+        return table
+
+    def _lookup_defect_type(self, class_name: str, model_type: ModelType) -> DefectType:
+        """Map a class name to DefectType via the cache, resolving unseen names once"""
+        defect_type = self._class_map.get(class_name)
+        if defect_type is None:
+            defect_type = self._map_class_to_defect_type(class_name, model_type)
+            self._class_map[class_name] = defect_type
+        return defect_type
+
     def _map_class_to_defect_type(self, class_name: str, model_type: ModelType) -> DefectType:
         """Map YOLO class name to DefectType"""
         class_lower = class_name.lower()
@@ -511,30 +901,35 @@ class MultiModelInferenceService:
         else:
             return DefectType.UNKNOWN
 
-    def _calculate_severity(self, confidence: float, bbox: List[int], defect_type: DefectType) -> DefectSeverity:
-        """Calculate severity based on confidence, size, and type"""
-        # Base severity on confidence
-        if confidence >= 0.90:
-            base_severity = DefectSeverity.HIGH
-        elif confidence >= 0.75:
-            base_severity = DefectSeverity.MEDIUM
-        else:
-            base_severity = DefectSeverity.LOW
+    def _calculate_severity(
+        self,
+        confidences: np.ndarray,
+        xywh: np.ndarray,
+        defect_codes: np.ndarray
+    ) -> np.ndarray:
+        """
+        Calculate severity codes based on confidence, size, and type
+
+        Vectorized over a batch; returns DefectSeverity codes (LOW=0 .. CRITICAL=3).
+        """
+        # Compare in float64 so thresholds match the Python float comparisons
+        confidences = confidences.astype(np.float64)
+
+        # Base severity on confidence: HIGH (2), MEDIUM (1) or LOW (0)
+        severity = (confidences >= 0.90).astype(np.uint8) + (confidences >= 0.75)
+
+        # Large defects are one level more severe
+        area = xywh[:, 2].astype(np.int64) * xywh[:, 3]
+        severity += area > 15000
 
-        # Adjust based on defect size
-        width, height = bbox[2], bbox[3]
-        area = width * height
+        # Critical defect types at HIGH with very high confidence become CRITICAL
+        critical = (severity == DefectSeverityCode.HIGH) & (confidences >= 0.95) & np.isin(defect_codes, _CRITICAL_TYPE_CODES)
+        severity[critical] = DefectSeverityCode.CRITICAL
 
-        # Large defects are more severe
-        if area > 15000:  # Large defect
-            severity_order = [DefectSeverity.LOW, DefectSeverity.MEDIUM, DefectSeverity.HIGH, DefectSeverity.CRITICAL]
-            current_idx = severity_order.index(base_severity)
-            if current_idx < len(severity_order) - 1:
-                base_severity = severity_order[current_idx + 1]
+        return severity
 
-        # Critical defect types
-        if defect_type in [DefectType.CRACK, DefectType.DAMAGE]:
-            if base_severity == DefectSeverity.HIGH and confidence >= 0.95:
-                base_severity = DefectSeverity.CRITICAL
 
-        return base_severity
+@cache
+def get_multi_model_service() -> MultiModelInferenceService:
+    """Process-wide service instance, so loaded models are shared across requests"""
+    return MultiModelInferenceService()
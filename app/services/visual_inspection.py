@@ -3,13 +3,22 @@ AI Visual Inspection Service
 Handles image preprocessing, defect detection, classification, and recommendations
 """
 
-import base64
+import asyncio
 import io
+import os
 import uuid
-from typing import Dict, List, Tuple
-from PIL import Image, ImageEnhance, ImageFilter
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Union
+from PIL import Image, ImageFilter
 import numpy as np
-from datetime import datetime
+from datetime import datetime, timezone
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_RGB
+    TURBOJPEG_AVAILABLE = True
+except ImportError:
+    TURBOJPEG_AVAILABLE = False
 
 from app.models.inspection import (
     AnalysisResponse,
@@ -18,78 +27,111 @@ from app.models.inspection import (
     DefectType,
     DefectSeverity,
     AssetCondition,
-    DefectLocation,
-    DefectDimensions
+    DefectSeverityCode,
+    defect_severity_codes,
+    decode_image_data,
+    fast_build
 )
 
 
+def _denoise_sharpen_kernel() -> ImageFilter.Kernel:
+    """
+    Single 5x5 kernel equal to a Gaussian blur (sigma 0.5) followed by
+    PIL's Sharpness(1.2) enhancement
+    """
+    gauss = np.exp(-np.arange(-1, 2) ** 2 / (2 * 0.5 ** 2))
+    gauss = np.outer(gauss, gauss) / gauss.sum() ** 2
+
+    # Sharpness(f) blends with PIL's SMOOTH filter: f * image + (1 - f) * smooth
+    smooth = np.array([[1, 1, 1], [1, 5, 1], [1, 1, 1]]) / 13
+    identity = np.zeros((3, 3))
+    identity[1, 1] = 1
+    sharpen = 1.2 * identity - 0.2 * smooth
+
+    kernel = np.zeros((5, 5))
+    for dy in range(3):
+        for dx in range(3):
+            kernel[dy:dy + 3, dx:dx + 3] += gauss[dy, dx] * sharpen
+
+    return ImageFilter.Kernel((5, 5), kernel.ravel().tolist(), scale=1)
+
+
 class ImagePreprocessor:
     """Handles underwater image preprocessing and enhancement"""
 
+    # Underwater color correction: boost red (absorbed quickly), damp blue (dominant)
+    COLOR_SCALE = np.array([1.3, 1.0, 0.9], dtype=np.float32)
+    CONTRAST = 1.3
+    BRIGHTNESS = 1.1
+
+    # ITU-R 601-2 luma weights, as used by PIL's 'L' conversion
+    _LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+    # Below this downscale ratio LANCZOS is indistinguishable from BILINEAR
+    BILINEAR_MAX_RATIO = 1.5
+
     def __init__(self):
         self.target_size = (640, 640)  # YOLOv11 standard input size
+        self._denoise_sharpen = _denoise_sharpen_kernel()
+
+        # Color-corrected value of every 8-bit level, per channel: (3, 256)
+        self._color_lut = np.clip(np.arange(256) * self.COLOR_SCALE[:, None].astype(np.float64), 0, 255)
 
     def preprocess(self, image: Image.Image) -> Image.Image:
         """
         Preprocess underwater image for AI analysis
 
         Steps:
-        1. Noise reduction
-        2. Color correction for underwater conditions
-        3. Contrast enhancement
-        4. Resolution normalization
+        1. Resolution normalization (first, so later steps touch fewer pixels)
+        2. Noise reduction and sharpening in one convolution
+        3. Color correction, contrast and brightness in one fused pass
         """
+        # Let libjpeg downscale while decoding; the draft keeps the image at
+        # least target_size, and is a no-op for non-JPEG or loaded images
+        image.draft('RGB', self.target_size)
+
         # Convert to RGB if needed
         if image.mode != 'RGB':
             image = image.convert('RGB')
 
-        # Noise reduction using blur filter
-        image = image.filter(ImageFilter.GaussianBlur(radius=0.5))
-
-        # Color correction for underwater (enhance red channel, reduce blue)
-        image = self._underwater_color_correction(image)
-
-        # Contrast enhancement
-        enhancer = ImageEnhance.Contrast(image)
-        image = enhancer.enhance(1.3)
-
-        # Brightness adjustment
-        brightness_enhancer = ImageEnhance.Brightness(image)
-        image = brightness_enhancer.enhance(1.1)
-
-        # Sharpness enhancement
-        sharpness_enhancer = ImageEnhance.Sharpness(image)
-        image = sharpness_enhancer.enhance(1.2)
+        # Resize to target size: near-size inputs only need BILINEAR; heavy
+        # downscales box-reduce by an integer factor first (reducing_gap) so
+        # LANCZOS filters at most a ~2x final step
+        ratio = max(image.width / self.target_size[0], image.height / self.target_size[1])
+        if ratio < self.BILINEAR_MAX_RATIO:
+            image = image.resize(self.target_size, Image.Resampling.BILINEAR)
+        else:
+            image = image.resize(self.target_size, Image.Resampling.LANCZOS, reducing_gap=2.0)
 
-        # Resize to target size
-        image = image.resize(self.target_size, Image.Resampling.LANCZOS)
+        # Noise reduction (Gaussian blur) and sharpness enhancement
+        image = image.filter(self._denoise_sharpen)
 
-        return image
+        # Color correction, contrast and brightness are all per-channel maps
+        # of 8-bit levels, so apply them together as one lookup table
+        return image.point(self._tone_lut(image))
 
-    def _underwater_color_correction(self, image: Image.Image) -> Image.Image:
-        """
-        Apply underwater color correction
-        Compensates for blue/green color cast common in underwater images
+    def _tone_lut(self, image: Image.Image) -> List[int]:
         """
-        img_array = np.array(image, dtype=np.float32)
-
-        # Enhance red channel (absorbed quickly underwater)
-        img_array[:, :, 0] = np.clip(img_array[:, :, 0] * 1.3, 0, 255)
+        Build the 768-entry (R, G, B) lookup table for color correction,
+        contrast and brightness
 
-        # Slightly reduce blue channel (dominant underwater)
-        img_array[:, :, 2] = np.clip(img_array[:, :, 2] * 0.9, 0, 255)
+        Contrast pivots on the mean luminance of the color-corrected image,
+        which is read off the channel histograms instead of the pixels.
+        """
+        histogram = np.asarray(image.histogram(), dtype=np.float64).reshape(3, 256)
+        channel_means = (histogram * self._color_lut).sum(axis=1) / histogram[0].sum()
+        mean = float(self._LUMA @ channel_means)
 
-        return Image.fromarray(img_array.astype(np.uint8))
+        lut = self._color_lut * (self.CONTRAST * self.BRIGHTNESS) + mean * (1 - self.CONTRAST) * self.BRIGHTNESS
+        return np.clip(lut, 0, 255).astype(np.uint8).ravel().tolist()
 
     def enhance_for_defect_detection(self, image: Image.Image) -> Image.Image:
-        """Additional enhancement specifically for defect detection"""
-        # Convert to grayscale for certain operations
-        gray = image.convert('L')
-
-        # Apply edge enhancement
-        edges = gray.filter(ImageFilter.FIND_EDGES)
+        """
+        Additional enhancement specifically for defect detection
 
-        # Combine with original
+        Currently a passthrough: the edge map it used to compute was never
+        combined with the image, so it is no longer built.
+        """
         return image
 
 
@@ -121,24 +163,25 @@ class DefectDetectionEngine:
 
         for detection in mock_detections:
             if detection['confidence'] >= self.confidence_threshold:
-                defect = DetectedDefect(
-                    id=f"defect_{uuid.uuid4().hex[:8]}",
-                    type=detection['type'],
-                    severity=detection['severity'],
-                    confidence=detection['confidence'],
-                    location=DefectLocation(
-                        x=detection['bbox'][0],
-                        y=detection['bbox'][1],
-                        width=detection['bbox'][2],
-                        height=detection['bbox'][3]
-                    ),
-                    description=detection['description'],
-                    dimensions=DefectDimensions(
-                        length=detection.get('length'),
-                        width=detection.get('width'),
-                        depth=detection.get('depth')
-                    ) if 'length' in detection else None
-                )
+                # Detections are produced internally, so skip re-validation
+                defect = fast_build(DetectedDefect, {
+                    'id': f"defect_{uuid.uuid4().hex[:8]}",
+                    'type': detection['type'],
+                    'severity': detection['severity'],
+                    'confidence': detection['confidence'],
+                    'location': {
+                        'x': detection['bbox'][0],
+                        'y': detection['bbox'][1],
+                        'width': detection['bbox'][2],
+                        'height': detection['bbox'][3]
+                    },
+                    'description': detection['description'],
+                    'dimensions': {
+                        'length': detection.get('length'),
+                        'width': detection.get('width'),
+                        'depth': detection.get('depth')
+                    } if 'length' in detection else None
+                })
                 defects.append(defect)
 
         return defects
@@ -225,10 +268,13 @@ class SeverityScoringEngine:
         if not defects:
             return AssetCondition.EXCELLENT
 
-        # Count defects by severity
-        critical_count = sum(1 for d in defects if d.severity == DefectSeverity.CRITICAL)
-        high_count = sum(1 for d in defects if d.severity == DefectSeverity.HIGH)
-        medium_count = sum(1 for d in defects if d.severity == DefectSeverity.MEDIUM)
+        # Count defects by severity in one pass
+        severity_counts = np.bincount(
+            defect_severity_codes(d.severity for d in defects), minlength=len(DefectSeverityCode)
+        )
+        critical_count = severity_counts[DefectSeverityCode.CRITICAL]
+        high_count = severity_counts[DefectSeverityCode.HIGH]
+        medium_count = severity_counts[DefectSeverityCode.MEDIUM]
 
         # Determine overall condition
         if critical_count > 0:
@@ -248,8 +294,26 @@ class SeverityScoringEngine:
             return 0.95  # High confidence if no defects found
 
         # Average confidence of all detections
-        avg_confidence = sum(d.confidence for d in defects) / len(defects)
-        return round(avg_confidence, 2)
+        confidences = np.fromiter((d.confidence for d in defects), dtype=np.float64, count=len(defects))
+        return round(float(confidences.mean()), 2)
+
+
+# Defect types counted individually in recommendation summaries
+_SUMMARY_TYPE_KEYS = {
+    DefectType.CORROSION: 'corrosion',
+    DefectType.CRACK: 'crack',
+    DefectType.FOULING: 'fouling',
+    DefectType.COATING: 'coating',
+    DefectType.WELD: 'weld'
+}
+
+_EMPTY_SUMMARY = {
+    'critical': 0,
+    'high': 0,
+    'medium': 0,
+    'low': 0,
+    **{key: 0 for key in _SUMMARY_TYPE_KEYS.values()}
+}
 
 
 class RecommendationEngine:
@@ -314,35 +378,10 @@ class RecommendationEngine:
 
     def _summarize_defects(self, defects: List[DetectedDefect]) -> Dict:
         """Summarize defects by type and severity"""
-        summary = {
-            'critical': 0,
-            'high': 0,
-            'medium': 0,
-            'low': 0,
-            'corrosion': 0,
-            'crack': 0,
-            'fouling': 0,
-            'coating': 0,
-            'weld': 0
-        }
-
-        for defect in defects:
-            # Count by severity
-            summary[defect.severity.value] += 1
-
-            # Count by type
-            if defect.type in [DefectType.CORROSION]:
-                summary['corrosion'] += 1
-            elif defect.type == DefectType.CRACK:
-                summary['crack'] += 1
-            elif defect.type == DefectType.FOULING:
-                summary['fouling'] += 1
-            elif defect.type == DefectType.COATING:
-                summary['coating'] += 1
-            elif defect.type == DefectType.WELD:
-                summary['weld'] += 1
-
-        return summary
+        summary = Counter(defect.severity.value for defect in defects)
+        summary.update(_SUMMARY_TYPE_KEYS[defect.type] for defect in defects if defect.type in _SUMMARY_TYPE_KEYS)
+
+        return {**_EMPTY_SUMMARY, **summary}
 
 
 class VisualInspectionService:
@@ -356,18 +395,41 @@ class VisualInspectionService:
         self.severity_scorer = SeverityScoringEngine()
         self.recommendation_engine = RecommendationEngine()
 
-    async def analyze_image(self, image_data: str) -> AnalysisResponse:
+        # Worker threads for analysis (decode, PIL and NumPy release the GIL)
+        self._executor = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+        # SIMD libjpeg-turbo decoder for JPEG uploads (None: decode with PIL)
+        self._turbojpeg = None
+        if TURBOJPEG_AVAILABLE:
+            try:
+                self._turbojpeg = TurboJPEG()
+            except (OSError, RuntimeError) as e:
+                print(f"⚠️  libturbojpeg not loadable, decoding JPEGs with PIL: {str(e)}")
+
+    async def analyze_image(self, image_data: Union[str, bytes, Image.Image]) -> AnalysisResponse:
         """
         Complete analysis pipeline for visual inspection
 
         Args:
-            image_data: Base64 encoded image string
+            image_data: Base64 encoded image string, raw image file bytes,
+                or an already decoded image
 
         Returns:
             AnalysisResponse with complete analysis results
         """
-        # Decode base64 image
-        image = self._decode_base64_image(image_data)
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, self._analyze_sync, image_data
+        )
+
+    def _analyze_sync(self, image_data: Union[str, bytes, Image.Image]) -> AnalysisResponse:
+        """Blocking analysis pipeline behind analyze_image and analyze_batch"""
+        # Decode image
+        if isinstance(image_data, Image.Image):
+            image = image_data
+        elif isinstance(image_data, bytes):
+            image = self._decode_image_bytes(image_data)
+        else:
+            image = self._decode_base64_image(image_data)
 
         # Preprocess image
         preprocessed_image = self.preprocessor.preprocess(image)
@@ -389,17 +451,18 @@ class VisualInspectionService:
         # Build response
         analysis_id = f"analysis_{uuid.uuid4().hex[:12]}"
 
-        result = AnalysisResult(
+        # Built from already-constructed defects; validation would only repeat work
+        result = AnalysisResult.model_construct(
             overall_condition=overall_condition,
             confidence=confidence,
             defects_detected=defects,
             recommendations=recommendations
         )
 
-        response = AnalysisResponse(
+        response = AnalysisResponse.model_construct(
             id=analysis_id,
             status="completed",
-            processed_at=datetime.utcnow(),
+            processed_at=datetime.now(timezone.utc),
             result=result
         )
 
@@ -407,29 +470,47 @@ class VisualInspectionService:
 
     def _decode_base64_image(self, image_data: str) -> Image.Image:
         """Decode base64 encoded image data"""
-        # Remove data URL prefix if present
-        if ',' in image_data:
-            image_data = image_data.split(',')[1]
+        return self._decode_image_bytes(decode_image_data(image_data))
 
-        # Decode base64
-        image_bytes = base64.b64decode(image_data)
+    def _decode_image_bytes(self, image_bytes: bytes) -> Image.Image:
+        """
+        Decode image file bytes, using libjpeg-turbo for JPEGs when available
 
-        # Open as PIL Image
-        image = Image.open(io.BytesIO(image_bytes))
+        Like PIL's draft mode, JPEGs are downscaled by the largest DCT factor
+        (1/2, 1/4, 1/8) that keeps them at least the preprocessing size.
+        """
+        if self._turbojpeg is not None and image_bytes[:2] == b"\xff\xd8":
+            try:
+                width, height, _, _ = self._turbojpeg.decode_header(image_bytes)
+                target_width, target_height = self.preprocessor.target_size
+                scaling_factor = next(
+                    ((1, d) for d in (8, 4, 2) if width // d >= target_width and height // d >= target_height),
+                    None
+                )
+                pixels = self._turbojpeg.decode(image_bytes, pixel_format=TJPF_RGB, scaling_factor=scaling_factor)
+                return Image.fromarray(pixels)
+            except OSError:
+                # e.g. CMYK JPEGs libjpeg-turbo won't convert; PIL handles them
+                pass
 
-        return image
+        # Open as PIL Image
+        return Image.open(io.BytesIO(image_bytes))
 
     async def analyze_batch(self, images: List[str]) -> List[AnalysisResponse]:
-        """Analyze multiple images in batch"""
+        """Analyze multiple images in batch, concurrently on the worker threads"""
+        loop = asyncio.get_running_loop()
+        outcomes = await asyncio.gather(
+            *(loop.run_in_executor(self._executor, self._analyze_sync, image_data) for image_data in images),
+            return_exceptions=True
+        )
+
         results = []
 
-        for image_data in images:
-            try:
-                result = await self.analyze_image(image_data)
-                results.append(result)
-            except Exception as e:
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
                 # Log error and continue with next image
-                print(f"Error analyzing image: {str(e)}")
+                print(f"Error analyzing image: {str(outcome)}")
                 continue
+            results.append(outcome)
 
         return results
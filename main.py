@@ -1,13 +1,16 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException, Query, Depends
+from fastapi import FastAPI, File, UploadFile, HTTPException, Query, Depends, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import Optional, List
 from sqlalchemy.orm import Session
 import uvicorn
+import aiofiles
 import os
-from datetime import datetime
+from datetime import datetime, timezone
 import uuid
-import json
+import orjson
 from app.models.inference import CableAnalysisModel
 from app.models.cable import (
     CableSegment,
@@ -20,22 +23,28 @@ from app.models.cable import (
 from app.models.inspection import (
     ImageAnalysisRequest,
     AnalysisResponse as InspectionAnalysisResponse,
+    decode_image_data,
 )
 from app.services.visual_inspection import VisualInspectionService
 from app.services.multi_model_inference import (
-    MultiModelInferenceService,
+    get_multi_model_service,
     ModelType,
     MultiModelResult,
 )
-from app.database.database import get_db, init_db
+from app.database.database import get_db, get_db_session, get_write_db, init_db
 from app.database import queries
 from app.database.models import CableRoute, CableInspection, ClientProfile
-from app.schemas.client_profile import ClientProfileResponse, ClientProfileUpdate
+from app.schemas.client_profile import (
+    ClientProfileResponse,
+    ClientProfileUpdate,
+    validate_client_profile,
+)
 
 app = FastAPI(
     title="Underwater Cable Analysis API",
     description="ML-powered image analysis for underwater cables",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 # CORS configuration for iOS frontend
@@ -68,11 +77,17 @@ class HealthResponse(BaseModel):
 # Create directories for image storage
 UPLOAD_DIR = "uploads"
 os.makedirs(UPLOAD_DIR, exist_ok=True)
+ALLOWED_IMAGE_TYPES = ("image/jpeg", "image/jpg", "image/png")
 
 # Initialize ML models
 ml_model = CableAnalysisModel()
 visual_inspection_service = VisualInspectionService()
-multi_model_service = MultiModelInferenceService()
+multi_model_service = get_multi_model_service()
+
+
+async def get_visual_inspection_service() -> VisualInspectionService:
+    """Dependency for FastAPI to get the shared visual inspection service"""
+    return visual_inspection_service
 
 
 # Initialize database on startup
@@ -123,6 +138,13 @@ async def startup_event():
 
         if model_found:
             print(f"   ✅ Model '{model_name}': Available")
+
+            # Load weights now so the first analysis doesn't pay for it
+            try:
+                await ml_model.warmup()
+                print(f"   ✅ Model '{model_name}': Preloaded")
+            except Exception as e:
+                print(f"   ⚠️  Model preload failed: {str(e)}")
         else:
             print(f"   ⚠️  Model '{model_name}': Not found")
             print(f"   Run: ollama pull {model_name}")
@@ -149,8 +171,6 @@ async def startup_event():
             print(f"   Location: {db_path}")
 
         # Get database statistics and seed default profile
-        from app.database.database import get_db_session
-
         with get_db_session() as db:
             from app.database.models import OilField, CableRoute, CableInspection
 
@@ -244,7 +264,7 @@ async def root():
     return HealthResponse(
         status="ok",
         message="Underwater Cable Analysis API is running",
-        timestamp=datetime.now().isoformat(),
+        timestamp=datetime.now(timezone.utc).isoformat(),
     )
 
 
@@ -254,7 +274,7 @@ async def health_check():
     return HealthResponse(
         status="healthy",
         message="All systems operational",
-        timestamp=datetime.now().isoformat(),
+        timestamp=datetime.now(timezone.utc).isoformat(),
     )
 
 
@@ -262,7 +282,10 @@ async def health_check():
 
 
 @app.post("/api/analyze", response_model=InspectionAnalysisResponse)
-async def analyze_visual_inspection(request: ImageAnalysisRequest):
+async def analyze_visual_inspection(
+    request: ImageAnalysisRequest,
+    service: VisualInspectionService = Depends(get_visual_inspection_service),
+):
     """
     AI-powered visual inspection endpoint for pipeline and subsea assets
 
@@ -276,7 +299,7 @@ async def analyze_visual_inspection(request: ImageAnalysisRequest):
     """
     try:
         # Perform AI analysis
-        result = await visual_inspection_service.analyze_image(request.imageData)
+        result = await service.analyze_image(request.image_bytes)
 
         return result
 
@@ -286,8 +309,122 @@ async def analyze_visual_inspection(request: ImageAnalysisRequest):
         )
 
 
+def record_inspection(
+    cable_route_id: str,
+    image_id: str,
+    latitude: float,
+    longitude: float,
+    depth: Optional[float],
+    analysis_result: dict,
+) -> None:
+    """
+    Store an analysis as an inspection of a known cable route (blocking)
+
+    Opens its own write session, so the single writer connection is only
+    held for this short transaction and never across model inference.
+    """
+    with get_db_session() as db:
+        # Get cable route from database
+        cable = queries.get_cable_route_by_id(db, cable_route_id)
+        if not cable:
+            return
+
+        # Create inspection record
+        inspection = CableInspection(
+            inspection_id=f"insp_{image_id}",
+            cable_route_id=cable.id,
+            inspection_date=datetime.now(timezone.utc),
+            latitude=latitude,
+            longitude=longitude,
+            depth=depth,
+            image_id=image_id,
+            condition=analysis_result.get("cable_condition", "unknown"),
+            detected_issues=orjson.dumps(analysis_result.get("detected_issues", [])).decode(),
+            confidence_score=analysis_result.get("confidence_score", 0.0),
+            recommendations=orjson.dumps(analysis_result.get("recommendations", [])).decode(),
+        )
+        db.add(inspection)
+
+        # Update cable's last inspection date
+        cable.last_inspection_date = datetime.now(timezone.utc)
+
+
+async def save_upload(file_path: str, contents: bytes) -> None:
+    """Write an uploaded image to disk without blocking the event loop"""
+    async with aiofiles.open(file_path, "wb") as f:
+        await f.write(contents)
+
+
+def check_image_type(file: UploadFile) -> None:
+    """Reject uploads that are not JPEG or PNG images"""
+    if file.content_type not in ALLOWED_IMAGE_TYPES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid file type. Allowed types: {', '.join(ALLOWED_IMAGE_TYPES)}",
+        )
+
+
+def build_analysis_result(image_id: str, analysis_result: dict) -> AnalysisResult:
+    """Response for one model analysis (the dict comes from the model's own parser)"""
+    return AnalysisResult.model_construct(
+        image_id=image_id,
+        timestamp=datetime.now(timezone.utc).isoformat(),
+        analysis_status="completed",
+        confidence_score=analysis_result.get("confidence_score", 0.0),
+        detected_issues=analysis_result.get("detected_issues", []),
+        cable_condition=analysis_result.get("cable_condition", "unknown"),
+        recommendations=analysis_result.get("recommendations", []),
+    )
+
+
+async def analyze_upload(
+    file: UploadFile,
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None,
+    depth: Optional[float] = None,
+    cable_route_id: Optional[str] = None,
+    persist: bool = False,
+    background_tasks: Optional[BackgroundTasks] = None,
+) -> AnalysisResult:
+    """
+    Analyze one uploaded image
+
+    The inspection is only recorded when cable_route_id and a location are
+    both given.
+    """
+    check_image_type(file)
+
+    # Generate unique ID for this analysis
+    image_id = str(uuid.uuid4())
+
+    # Inference works on the in-memory bytes; keeping a copy on disk is
+    # opt-in and happens after the response is sent
+    contents = await file.read()
+    if persist and background_tasks is not None:
+        file_path = os.path.join(UPLOAD_DIR, f"{image_id}_{file.filename}")
+        background_tasks.add_task(save_upload, file_path, contents)
+
+    # Perform ML inference
+    try:
+        analysis_result = await ml_model.analyze_bytes(contents)
+
+        # Save inspection to database if cable_route_id and location provided;
+        # the SQLite write runs on the threadpool so it never stalls the loop
+        if cable_route_id and latitude is not None and longitude is not None:
+            await run_in_threadpool(
+                record_inspection, cable_route_id, image_id,
+                latitude, longitude, depth, analysis_result
+            )
+
+        return build_analysis_result(image_id, analysis_result)
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+
+
 @app.post("/api/analyze-file", response_model=AnalysisResult)
 async def analyze_image(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     latitude: Optional[float] = Query(
         None, ge=-90, le=90, description="Latitude of image location"
@@ -299,7 +436,9 @@ async def analyze_image(
     cable_route_id: Optional[str] = Query(
         None, description="Route ID of cable being inspected"
     ),
-    db: Session = Depends(get_db),
+    persist: bool = Query(
+        False, description="Keep a copy of the uploaded image in the upload directory"
+    ),
 ):
     """
     Main endpoint for underwater cable image analysis
@@ -310,70 +449,10 @@ async def analyze_image(
     - Confidence scores
     - Recommendations
     """
-    # Validate file type
-    allowed_types = ["image/jpeg", "image/jpg", "image/png"]
-    if file.content_type not in allowed_types:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid file type. Allowed types: {', '.join(allowed_types)}",
-        )
-
-    # Generate unique ID for this analysis
-    image_id = str(uuid.uuid4())
-
-    # Save uploaded file
-    file_path = os.path.join(UPLOAD_DIR, f"{image_id}_{file.filename}")
-    contents = await file.read()
-    with open(file_path, "wb") as f:
-        f.write(contents)
-
-    # Perform ML inference
-    try:
-        analysis_result = await ml_model.analyze_image(file_path)
-
-        # Save inspection to database if cable_route_id and location provided
-        inspection_id = f"insp_{image_id}"
-        if cable_route_id and latitude is not None and longitude is not None:
-            # Get cable route from database
-            cable = queries.get_cable_route_by_id(db, cable_route_id)
-            if cable:
-                # Create inspection record
-                inspection = CableInspection(
-                    inspection_id=inspection_id,
-                    cable_route_id=cable.id,
-                    inspection_date=datetime.utcnow(),
-                    latitude=latitude,
-                    longitude=longitude,
-                    depth=depth,
-                    image_id=image_id,
-                    condition=analysis_result.get("cable_condition", "unknown"),
-                    detected_issues=json.dumps(
-                        analysis_result.get("detected_issues", [])
-                    ),
-                    confidence_score=analysis_result.get("confidence_score", 0.0),
-                    recommendations=json.dumps(
-                        analysis_result.get("recommendations", [])
-                    ),
-                )
-                db.add(inspection)
-
-                # Update cable's last inspection date
-                cable.last_inspection_date = datetime.utcnow()
-
-                db.commit()
-
-        return AnalysisResult(
-            image_id=image_id,
-            timestamp=datetime.utcnow().isoformat(),
-            analysis_status="completed",
-            confidence_score=analysis_result.get("confidence_score", 0.0),
-            detected_issues=analysis_result.get("detected_issues", []),
-            cable_condition=analysis_result.get("cable_condition", "unknown"),
-            recommendations=analysis_result.get("recommendations", []),
-        )
-
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+    return await analyze_upload(
+        file, latitude, longitude, depth, cable_route_id,
+        persist=persist, background_tasks=background_tasks
+    )
 
 
 @app.post("/api/batch-analyze")
@@ -381,24 +460,32 @@ async def batch_analyze_images(files: List[UploadFile] = File(...)):
     """
     Batch endpoint for analyzing multiple images
     """
-    results = []
+    results: list = [None] * len(files)
 
-    for file in files:
+    # Read every valid upload, then analyze them together; the model bounds
+    # how many analyses are in flight at once
+    accepted = []
+    for i, file in enumerate(files):
         try:
-            result = await analyze_image(file)
-            results.append(result)
-        except Exception as e:
-            results.append({"error": str(e), "filename": file.filename})
+            check_image_type(file)
+        except HTTPException as e:
+            results[i] = {"error": str(e), "filename": file.filename}
+        else:
+            accepted.append((i, await file.read()))
+
+    analyses = await ml_model.analyze_images([contents for _, contents in accepted])
+    for (i, _), analysis_result in zip(accepted, analyses):
+        results[i] = build_analysis_result(str(uuid.uuid4()), analysis_result)
 
     return {
         "total_images": len(files),
         "results": results,
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
     }
 
 
 @app.get("/api/analysis/{image_id}", response_model=AnalysisResult)
-async def get_analysis_result(image_id: str, db: Session = Depends(get_db)):
+def get_analysis_result(image_id: str, db: Session = Depends(get_db)):
     """
     Retrieve previous analysis results by image ID
     """
@@ -412,26 +499,29 @@ async def get_analysis_result(image_id: str, db: Session = Depends(get_db)):
             status_code=404, detail=f"Analysis not found for image_id: {image_id}"
         )
 
-    return AnalysisResult(
+    # Stored rows were validated on write
+    return AnalysisResult.model_construct(
         image_id=image_id,
         timestamp=inspection.inspection_date.isoformat(),
         analysis_status="completed",
         confidence_score=inspection.confidence_score,
         detected_issues=(
-            json.loads(inspection.detected_issues) if inspection.detected_issues else []
+            orjson.loads(inspection.detected_issues) if inspection.detected_issues else []
         ),
         cable_condition=inspection.condition,
         recommendations=(
-            json.loads(inspection.recommendations) if inspection.recommendations else []
+            orjson.loads(inspection.recommendations) if inspection.recommendations else []
         ),
     )
 
 
 # Cable Management Endpoints
+# Handlers that only use the database are plain functions: FastAPI runs
+# them on its threadpool, so blocking SQLite calls never stall the event loop
 
 
 @app.post("/api/cables", status_code=201)
-async def create_cable_route(
+def create_cable_route(
     route_id: str = Query(..., description="Unique route identifier"),
     name: str = Query(..., description="Cable route name"),
     start_field_id: str = Query(..., description="Starting field ID"),
@@ -439,7 +529,7 @@ async def create_cable_route(
     cable_type: str = Query(..., description="Type of cable"),
     length_km: float = Query(..., gt=0, description="Length in kilometers"),
     installation_year: Optional[int] = Query(None, description="Installation year"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_write_db),
 ):
     """
     Register a new cable route for tracking
@@ -469,7 +559,7 @@ async def create_cable_route(
 
 
 @app.get("/api/cables")
-async def get_cable_routes(
+def get_cable_routes(
     operational: Optional[bool] = Query(
         None, description="Filter by operational status"
     ),
@@ -486,15 +576,13 @@ async def get_cable_routes(
             db, days_since_last_inspection=180
         )
     else:
-        cables = db.query(CableRoute).all()
-        if operational is not None:
-            cables = [c for c in cables if c.operational == operational]
+        cables = queries.get_cable_routes(db, operational=operational)
 
     return cables
 
 
 @app.get("/api/cables/{route_id}")
-async def get_cable_route(route_id: str, db: Session = Depends(get_db)):
+def get_cable_route(route_id: str, db: Session = Depends(get_db)):
     """
     Get specific cable route by ID
     """
@@ -505,15 +593,17 @@ async def get_cable_route(route_id: str, db: Session = Depends(get_db)):
 
 
 @app.get("/api/cables/{route_id}/inspections")
-async def get_cable_inspections(route_id: str, db: Session = Depends(get_db)):
+def get_cable_inspections(route_id: str, db: Session = Depends(get_db)):
     """
     Get all inspection points for a specific cable route
     """
-    cable = queries.get_cable_route_by_id(db, route_id)
-    if not cable:
+    inspections = queries.get_inspections_for_route(db, route_id)
+
+    # An empty history only needs the extra lookup to tell "no inspections"
+    # from "no such route"
+    if not inspections and not queries.get_cable_route_by_id(db, route_id):
         raise HTTPException(status_code=404, detail="Cable route not found")
 
-    inspections = queries.get_inspections_for_cable(db, cable.id)
     return inspections
 
 
@@ -521,7 +611,7 @@ async def get_cable_inspections(route_id: str, db: Session = Depends(get_db)):
 
 
 @app.get("/api/inspections/nearby")
-async def get_nearby_inspections(
+def get_nearby_inspections(
     latitude: float = Query(..., ge=-90, le=90),
     longitude: float = Query(..., ge=-180, le=180),
     radius_km: float = Query(10.0, gt=0, description="Search radius in kilometers"),
@@ -547,7 +637,7 @@ async def get_nearby_inspections(
                     "depth": inspection.depth,
                     "condition": inspection.condition,
                     "detected_issues": (
-                        json.loads(inspection.detected_issues)
+                        orjson.loads(inspection.detected_issues)
                         if inspection.detected_issues
                         else []
                     ),
@@ -561,7 +651,7 @@ async def get_nearby_inspections(
 
 
 @app.get("/api/inspections")
-async def get_all_inspections(
+def get_all_inspections(
     condition: Optional[str] = Query(None, description="Filter by condition"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of results"),
     db: Session = Depends(get_db),
@@ -569,34 +659,24 @@ async def get_all_inspections(
     """
     Get all inspection points (for map display)
     """
-    if condition:
-        inspections = queries.get_inspections_by_condition(db, condition)
-    else:
-        inspections = (
-            db.query(CableInspection)
-            .order_by(CableInspection.inspection_date.desc())
-            .limit(limit)
-            .all()
-        )
-
-    return inspections
+    return queries.get_latest_inspections(db, limit=limit, condition=condition or None)
 
 
 # Client Profile Endpoints
 
 
 @app.get("/api/profile", response_model=ClientProfileResponse)
-async def get_client_profile(db: Session = Depends(get_db)):
+def get_client_profile(db: Session = Depends(get_write_db)):
     """
     Get the current client profile
     """
     profile = queries.get_or_create_default_profile(db)
-    return profile
+    return validate_client_profile(profile)
 
 
 @app.put("/api/profile", response_model=ClientProfileResponse)
-async def update_client_profile(
-    profile_update: ClientProfileUpdate, db: Session = Depends(get_db)
+def update_client_profile(
+    profile_update: ClientProfileUpdate, db: Session = Depends(get_write_db)
 ):
     """
     Update the client profile
@@ -620,7 +700,7 @@ async def update_client_profile(
             db, {"profile_key": "default_profile", **update_data}
         )
 
-    return profile
+    return validate_client_profile(profile)
 
 
 # Multi-Model AI Analysis Endpoints
@@ -738,15 +818,8 @@ async def analyze_with_multiple_models(request: MultiModelAnalysisRequest):
         # Decode base64 image
         from PIL import Image
         import io
-        import base64
 
-        if "," in request.imageData:
-            image_data = request.imageData.split(",")[1]
-        else:
-            image_data = request.imageData
-
-        image_bytes = base64.b64decode(image_data)
-        image = Image.open(io.BytesIO(image_bytes))
+        image = Image.open(io.BytesIO(decode_image_data(request.imageData)))
 
         # Convert model names to enums
         models_to_use = None
@@ -779,7 +852,7 @@ async def analyze_with_multiple_models(request: MultiModelAnalysisRequest):
                     "defect_type": det.defect_type.value,
                     "severity": det.severity.value,
                 }
-                for det in detections
+                for det in detections.to_detections()
             ]
 
         # Format consensus detections
@@ -812,7 +885,7 @@ async def analyze_with_multiple_models(request: MultiModelAnalysisRequest):
         return MultiModelAnalysisResponse(
             id=analysis_id,
             status="completed",
-            analyzed_at=datetime.utcnow(),
+            analyzed_at=datetime.now(timezone.utc),
             models_used=result.analysis_metadata.get("models_used", []),
             detections_by_model=detections_by_model,
             consensus_detections=consensus_detections,
@@ -838,6 +911,7 @@ async def analyze_enhanced_visual_inspection(
     use_multi_model: bool = Query(
         True, description="Use multiple AI models for analysis"
     ),
+    service: VisualInspectionService = Depends(get_visual_inspection_service),
 ):
     """
     Enhanced AI visual inspection with optional multi-model analysis
@@ -850,19 +924,8 @@ async def analyze_enhanced_visual_inspection(
     """
     try:
         if use_multi_model:
-            # Use multi-model analysis
-            from PIL import Image
-            import io
-            import base64
-
-            # Decode image
-            if "," in request.imageData:
-                image_data = request.imageData.split(",")[1]
-            else:
-                image_data = request.imageData
-
-            image_bytes = base64.b64decode(image_data)
-            image = Image.open(io.BytesIO(image_bytes))
+            # Use multi-model analysis (image was decoded during validation)
+            image = request.open_image()
 
             # Run multi-model analysis
             multi_result: MultiModelResult = (
@@ -894,22 +957,22 @@ async def analyze_enhanced_visual_inspection(
             # Build response
             analysis_id = f"enhanced_analysis_{uuid.uuid4().hex[:12]}"
 
-            result = AnalysisResult(
+            result = AnalysisResult.model_construct(
                 overall_condition=overall_condition,
                 confidence=multi_result.overall_confidence,
                 defects_detected=multi_result.consensus_detections,
                 recommendations=recommendations,
             )
 
-            return InspectionAnalysisResponse(
+            return InspectionAnalysisResponse.model_construct(
                 id=analysis_id,
                 status="completed",
-                processed_at=datetime.utcnow(),
+                processed_at=datetime.now(timezone.utc),
                 result=result,
             )
         else:
             # Use standard single-model analysis
-            result = await visual_inspection_service.analyze_image(request.imageData)
+            result = await service.analyze_image(request.image_bytes)
             return result
 
     except Exception as e:
@@ -919,4 +982,15 @@ async def analyze_enhanced_visual_inspection(
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=4000)
+    # uvloop and httptools come with uvicorn[standard]. Each extra worker
+    # process loads its own copy of the inference models, so scaling out is
+    # opt-in via UVICORN_WORKERS (multiple workers need an import string).
+    workers = int(os.getenv("UVICORN_WORKERS", "1"))
+    uvicorn.run(
+        "main:app" if workers > 1 else app,
+        host="0.0.0.0",
+        port=4000,
+        loop="uvloop",
+        http="httptools",
+        workers=workers,
+    )
@@ -10,6 +10,7 @@ from datetime import datetime
 sys.path.append(str(Path(__file__).parent.parent))
 
 from app.database.database import init_db, get_db_session
+from app.database.queries import bulk_upsert_fields
 from app.database.models import (
     OilField, FieldLocation, LicenseBlock, Platform,
     Operator, FieldRelationship, InfrastructureCluster, ClusterMember
@@ -585,24 +586,26 @@ def migrate_fields(db):
     """Migrate oil fields with locations, blocks, and platforms"""
     print("Migrating oil fields...")
 
-    for field_data in OIL_FIELDS_DATA:
-        # Create oil field
-        field = OilField(
-            field_id=field_data["field_id"],
-            name=field_data["name"],
-            operator=field_data["operator"],
-            status=field_data["status"],
-            discovery_year=field_data.get("discovery_year"),
-            production_start_year=field_data.get("production_start_year"),
-            sea_area=field_data["sea_area"],
-            resource_type=field_data["resource_type"],
-            description=field_data.get("description"),
-            infrastructure_notes=field_data.get("infrastructure_notes"),
-            estimated_resources_mmboe=field_data.get("estimated_resources_mmboe"),
-            hub_field_id=field_data.get("hub_field_id")
-        )
-        db.add(field)
+    # Upsert all fields in one batched statement
+    bulk_upsert_fields(db, [
+        {
+            "field_id": field_data["field_id"],
+            "name": field_data["name"],
+            "operator": field_data["operator"],
+            "status": field_data["status"],
+            "discovery_year": field_data.get("discovery_year"),
+            "production_start_year": field_data.get("production_start_year"),
+            "sea_area": field_data["sea_area"],
+            "resource_type": field_data["resource_type"],
+            "description": field_data.get("description"),
+            "infrastructure_notes": field_data.get("infrastructure_notes"),
+            "estimated_resources_mmboe": field_data.get("estimated_resources_mmboe"),
+            "hub_field_id": field_data.get("hub_field_id")
+        }
+        for field_data in OIL_FIELDS_DATA
+    ])
 
+    for field_data in OIL_FIELDS_DATA:
         # Create field location
         loc_data = field_data["location"]
         location = FieldLocation(
@@ -6,7 +6,7 @@ Tests the /api/analyze endpoint with a sample image
 import asyncio
 import base64
 import json
-from datetime import datetime
+from datetime import datetime, timezone
 from PIL import Image
 import io
 
@@ -113,7 +113,7 @@ async def test_api_request_format():
     # Create request matching frontend format
     request = ImageAnalysisRequest(
         imageData=image_data,
-        timestamp=datetime.utcnow(),
+        timestamp=datetime.now(timezone.utc),
         metadata={
             "latitude": 60.5,
             "longitude": 3.5,
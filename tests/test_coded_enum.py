@@ -0,0 +1,122 @@
+"""
+Tests for CodedEnum columns and upgrading databases created before them
+"""
+
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.database.models import Base, CableInspection, CableRoute, ConditionType
+
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SHIPPED_DB = REPO_ROOT / "data" / "oil_fields.db"
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        session.add(CableRoute(
+            route_id="R1", name="Route 1", start_field_id="A", end_field_id="B",
+            cable_type="fiber_optic", length_km=1.0
+        ))
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+def _add_inspection(db, condition):
+    db.add(CableInspection(
+        inspection_id=f"insp_{condition}", cable_route_id=1,
+        inspection_date=datetime(2024, 1, 1), condition=condition
+    ))
+    db.commit()
+
+
+def test_round_trip_stores_code_and_reads_string(db):
+    _add_inspection(db, "poor")
+    db.expire_all()
+
+    stored = db.execute(text("SELECT condition FROM cable_inspections")).scalar_one()
+    assert stored == ConditionType.values.index("poor")
+    assert db.execute(select(CableInspection.condition)).scalar_one() == "poor"
+
+    route = db.execute(select(CableRoute)).scalar_one()
+    assert route.cable_type == "fiber_optic"
+
+
+def test_filter_on_unknown_value_matches_nothing(db):
+    _add_inspection(db, "good")
+
+    assert db.execute(
+        select(CableInspection).where(CableInspection.condition == "not_a_condition")
+    ).scalars().all() == []
+
+
+def test_insert_of_unknown_value_is_rejected(db):
+    with pytest.raises(IntegrityError):
+        _add_inspection(db, "not_a_condition")
+
+
+def test_result_value_accepts_legacy_strings_and_rejects_bad_codes():
+    assert ConditionType.process_result_value("fair", None) == "fair"
+    with pytest.raises(ValueError):
+        ConditionType.process_result_value(len(ConditionType.values), None)
+    with pytest.raises(ValueError):
+        ConditionType.process_result_value("not_a_condition", None)
+
+
+def _run(code_or_script, db_path):
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{db_path}")
+    args = [code_or_script] if code_or_script.endswith(".py") else ["-c", code_or_script]
+    return subprocess.run(
+        [sys.executable, *args], cwd=REPO_ROOT, env=env, capture_output=True, text=True
+    )
+
+
+def test_migrate_data_runs_against_shipped_database(tmp_path):
+    db_path = tmp_path / "oil_fields.db"
+    shutil.copy(SHIPPED_DB, db_path)
+
+    result = _run("scripts/migrate_data.py", db_path)
+
+    assert result.returncode == 0, result.stderr
+    with sqlite3.connect(db_path) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM oil_fields").fetchone()[0] > 0
+
+
+def test_init_db_converts_legacy_string_columns(tmp_path):
+    db_path = tmp_path / "legacy.db"
+    with sqlite3.connect(db_path) as connection:
+        connection.execute("""
+            CREATE TABLE cable_routes (
+                id INTEGER PRIMARY KEY, route_id VARCHAR(50) NOT NULL, name VARCHAR(100) NOT NULL,
+                start_field_id VARCHAR(50) NOT NULL, end_field_id VARCHAR(50) NOT NULL,
+                cable_type VARCHAR(30) NOT NULL, length_km FLOAT NOT NULL,
+                CHECK (cable_type IN ('power', 'communication', 'umbilical', 'fiber_optic'))
+            )
+        """)
+        connection.execute(
+            "INSERT INTO cable_routes VALUES (1, 'R1', 'Route 1', 'A', 'B', 'umbilical', 2.5)"
+        )
+
+    result = _run("from app.database.database import init_db; init_db()", db_path)
+
+    assert result.returncode == 0, result.stderr
+    engine = create_engine(f"sqlite:///{db_path}")
+    with Session(engine) as session:
+        route = session.execute(select(CableRoute)).scalar_one()
+        assert (route.route_id, route.cable_type, route.length_km) == ("R1", "umbilical", 2.5)
+        assert session.execute(text("SELECT cable_type FROM cable_routes")).scalar_one() == 2
+    engine.dispose()
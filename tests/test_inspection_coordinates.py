@@ -0,0 +1,82 @@
+"""
+Tests for the cached inspection coordinate snapshot behind nearby search
+"""
+
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import Session
+
+from app.database import queries
+from app.database.models import Base, CableInspection, CableRoute
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    queries.invalidate_inspection_coordinates()
+    with Session(engine) as session:
+        session.add(CableRoute(
+            route_id="R1", name="Route 1", start_field_id="A", end_field_id="B",
+            cable_type="power", length_km=1.0
+        ))
+        session.commit()
+        yield session
+    engine.dispose()
+
+
+def _add_inspection(db, inspection_id, latitude, longitude):
+    inspection = CableInspection(
+        inspection_id=inspection_id, cable_route_id=1, inspection_date=datetime(2024, 1, 1),
+        latitude=latitude, longitude=longitude
+    )
+    db.add(inspection)
+    db.commit()
+    return inspection
+
+
+def _nearby_ids(db, latitude, longitude):
+    return [
+        inspection.inspection_id
+        for inspection, _ in queries.get_inspections_near_location(db, latitude, longitude, radius_km=5)
+    ]
+
+
+def test_delete_then_insert_reusing_the_rowid_is_seen(db):
+    _add_inspection(db, "a", 58.0, 4.0)
+    last = _add_inspection(db, "b", 60.0, 5.0)
+    assert _nearby_ids(db, 60.0, 5.0) == ["b"]
+
+    # Without AUTOINCREMENT SQLite hands the deleted rowid to the next insert,
+    # so row count and highest id end up unchanged
+    db.delete(last)
+    db.commit()
+    replacement = _add_inspection(db, "c", 62.0, 6.0)
+    assert replacement.id == last.id
+
+    assert _nearby_ids(db, 60.0, 5.0) == []
+    assert _nearby_ids(db, 62.0, 6.0) == ["c"]
+
+
+def test_moved_coordinates_are_seen(db):
+    inspection = _add_inspection(db, "a", 58.0, 4.0)
+    assert _nearby_ids(db, 58.0, 4.0) == ["a"]
+
+    inspection.latitude = 59.0
+    db.commit()
+
+    assert _nearby_ids(db, 58.0, 4.0) == []
+    assert _nearby_ids(db, 59.0, 4.0) == ["a"]
+
+
+def test_explicit_invalidation_after_raw_sql_update(db):
+    _add_inspection(db, "a", 58.0, 4.0)
+    assert _nearby_ids(db, 58.0, 4.0) == ["a"]
+
+    db.execute(text("UPDATE cable_inspections SET latitude = 59.0"))
+    db.commit()
+    queries.invalidate_inspection_coordinates()
+
+    assert _nearby_ids(db, 59.0, 4.0) == ["a"]
@@ -0,0 +1,91 @@
+"""
+Tests for the vectorized detection overlap used by multi-model consensus
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from app.services import multi_model_inference
+from app.services.multi_model_inference import _pairwise_iou
+
+
+def _reference_iou(bbox1, bbox2):
+    """Scalar IoU between two [x, y, width, height] boxes"""
+    x1_1, y1_1, w1, h1 = bbox1
+    x2_1, y2_1 = x1_1 + w1, y1_1 + h1
+
+    x1_2, y1_2, w2, h2 = bbox2
+    x2_2, y2_2 = x1_2 + w2, y1_2 + h2
+
+    x1_i = max(x1_1, x1_2)
+    y1_i = max(y1_1, y1_2)
+    x2_i = min(x2_1, x2_2)
+    y2_i = min(y2_1, y2_2)
+
+    if x2_i < x1_i or y2_i < y1_i:
+        return 0.0
+
+    intersection = (x2_i - x1_i) * (y2_i - y1_i)
+    union = w1 * h1 + w2 * h2 - intersection
+
+    return intersection / union if union > 0 else 0.0
+
+
+def _reference_groups(bboxes, iou_threshold):
+    """Greedy grouping in seed order with the scalar IoU"""
+    group_ids = [-1] * len(bboxes)
+    next_group = 0
+    for i in range(len(bboxes)):
+        if group_ids[i] != -1:
+            continue
+        group_ids[i] = next_group
+        for j in range(i + 1, len(bboxes)):
+            if group_ids[j] == -1 and _reference_iou(bboxes[i], bboxes[j]) >= iou_threshold:
+                group_ids[j] = next_group
+        next_group += 1
+    return group_ids
+
+
+def _random_boxes(n, seed=0):
+    rng = np.random.default_rng(seed)
+    boxes = np.column_stack((
+        rng.integers(0, 200, n), rng.integers(0, 200, n),
+        rng.integers(0, 80, n), rng.integers(0, 80, n),
+    )).astype(np.float64)
+    # Include touching, identical and zero-area boxes
+    boxes[:4] = [[10, 10, 20, 20], [30, 10, 20, 20], [10, 10, 20, 20], [50, 50, 0, 0]]
+    return boxes
+
+
+@pytest.mark.parametrize("use_scratch", [False, True])
+def test_pairwise_iou_matches_scalar_reference(use_scratch):
+    boxes = _random_boxes(40)
+    scratch = np.empty((3, 64, 64)) if use_scratch else None
+
+    iou = _pairwise_iou(boxes, scratch)
+
+    expected = np.array([[_reference_iou(a, b) for b in boxes] for a in boxes])
+    np.testing.assert_allclose(iou, expected, rtol=1e-12, atol=0)
+
+
+@pytest.mark.skipif(not multi_model_inference.NUMBA_AVAILABLE, reason="numba not installed")
+def test_numba_grouping_matches_scalar_reference():
+    boxes = _random_boxes(60, seed=1)
+
+    group_ids = multi_model_inference._group_boxes_nb(boxes, 0.3)
+
+    assert group_ids.tolist() == _reference_groups(boxes, 0.3)
+
+
+def test_numpy_grouping_matches_scalar_reference(monkeypatch):
+    monkeypatch.setattr(multi_model_inference, "NUMBA_AVAILABLE", False)
+    service = SimpleNamespace(_iou_scratch=None)
+    boxes = _random_boxes(60, seed=1)
+
+    group_ids = multi_model_inference.MultiModelInferenceService._group_overlapping_detections(
+        service, boxes, 0.3
+    )
+
+    assert group_ids.tolist() == _reference_groups(boxes, 0.3)
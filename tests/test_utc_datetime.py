@@ -0,0 +1,59 @@
+"""
+Tests for UTCDateTime timestamp columns
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import Session
+
+from app.database.models import Base, CableRoute
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def _add_route(db, last_inspection_date):
+    db.add(CableRoute(
+        route_id="R1", name="Route 1", start_field_id="A", end_field_id="B",
+        cable_type="power", length_km=1.0, last_inspection_date=last_inspection_date
+    ))
+    db.commit()
+    db.expire_all()
+    return db.execute(select(CableRoute)).scalar_one()
+
+
+def test_aware_value_is_stored_as_naive_utc_and_read_back_aware(db):
+    oslo = timezone(timedelta(hours=2))
+    route = _add_route(db, datetime(2024, 6, 1, 14, 30, tzinfo=oslo))
+
+    stored = db.execute(text("SELECT last_inspection_date FROM cable_routes")).scalar_one()
+    assert stored.startswith("2024-06-01 12:30:00")
+    assert route.last_inspection_date == datetime(2024, 6, 1, 12, 30, tzinfo=timezone.utc)
+    assert route.last_inspection_date.tzinfo is timezone.utc
+
+
+def test_server_default_timestamps_read_back_aware(db):
+    route = _add_route(db, None)
+
+    assert route.created_at.tzinfo is timezone.utc
+    assert abs(datetime.now(timezone.utc) - route.created_at) < timedelta(minutes=1)
+
+
+def test_aware_cutoff_filters_in_sql(db):
+    _add_route(db, datetime(2024, 1, 1, tzinfo=timezone.utc))
+
+    cutoff = datetime(2024, 1, 1, 1, tzinfo=timezone(timedelta(hours=2)))
+    assert db.execute(
+        select(CableRoute.route_id).where(CableRoute.last_inspection_date < cutoff)
+    ).scalars().all() == []
+    assert db.execute(
+        select(CableRoute.route_id).where(CableRoute.last_inspection_date > cutoff)
+    ).scalars().all() == ["R1"]